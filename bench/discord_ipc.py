@@ -0,0 +1,97 @@
+"""
+Presence update latency: pypresence's Presence.update() against DiscordIPC.update(), over a fake Discord
+IPC server that answers each SET_ACTIVITY after REPLY_DELAY seconds (Discord's own processing time).
+
+pypresence waits for every reply, so each update blocks for the round trip; DiscordIPC only queues the
+frame and matches the reply later. Reports how long the caller is blocked per update, and the reply
+round trip each client sees.
+
+    python3 bench/discord_ipc.py [updates] [reply delay in ms]
+"""
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "tests"))
+from fakes import FakeDiscordServer  # noqa: E402
+import resolve_rich_presence as rrp  # noqa: E402
+
+CLIENT_ID = "1234567890"
+
+
+def serve(path, reply_delay):
+    """Runs a FakeDiscordServer on its own thread and loop; returns it once it listens."""
+    ready = threading.Event()
+    box = []
+
+    def run():
+        loop = asyncio.new_event_loop()
+        box.append(loop.run_until_complete(FakeDiscordServer(path, reply_delay=reply_delay).start()))
+        ready.set()
+        loop.run_forever()
+    threading.Thread(target=run, daemon=True).start()
+    ready.wait()
+    return box[0]
+
+
+def payload(i):
+    return dict(state=f"Editing: Timeline {i}", details="Project: Film", start=1700000000,
+                large_image="davinci", large_text="01:00:00:00")
+
+
+def bench_pypresence(updates):
+    from pypresence import Presence
+    rpc = Presence(CLIENT_ID)
+    rpc.connect()
+    blocked = []
+    for i in range(updates):
+        started = time.perf_counter()
+        rpc.update(**payload(i))
+        blocked.append(time.perf_counter() - started)
+    rpc.close()
+    return blocked, blocked  # The call returns with the reply: blocked time is the round trip
+
+
+async def bench_discord_ipc(path, updates, reply_delay):
+    client = rrp.DiscordIPC(CLIENT_ID, paths=[path])
+    await client.connect()
+    blocked, round_trips = [], []
+    for i in range(updates):
+        started = time.perf_counter()
+        client.update(**payload(i))
+        blocked.append(time.perf_counter() - started)
+        # Paced like the app's updates, so every reply comes back before the next frame
+        while client.acked <= i:
+            await asyncio.sleep(reply_delay / 4 or 0.0005)
+        round_trips.append(client.last_ack_latency)
+    client.close()
+    return blocked, round_trips
+
+
+def report(name, blocked, round_trips):
+    ms = lambda values: statistics.median(values) * 1000  # noqa: E731
+    print(f"{name:12s} blocked per update: median {ms(blocked):7.3f} ms, max {max(blocked) * 1000:7.3f} ms; "
+          f"reply round trip: median {ms(round_trips):6.2f} ms")
+
+
+def main():
+    updates = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    reply_delay = (float(sys.argv[2]) if len(sys.argv) > 2 else 20) / 1000
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ["XDG_RUNTIME_DIR"] = directory  # Where pypresence looks for the socket
+        path = os.path.join(directory, "discord-ipc-0")
+        serve(path, reply_delay)
+        print(f"{updates} updates, Discord replying after {reply_delay * 1000:g} ms")
+        try:
+            report("pypresence", *bench_pypresence(updates))
+        except ImportError:
+            print("pypresence not installed, skipped")
+        report("DiscordIPC", *asyncio.run(bench_discord_ipc(path, updates, reply_delay)))
+
+
+if __name__ == "__main__":
+    main()
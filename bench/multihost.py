@@ -0,0 +1,71 @@
+"""
+How the monitor scales with the number of Resolve workstations. Every fake host takes CONNECT_LATENCY to
+connect and CALL_LATENCY per scripting call; the hosts are polled concurrently, on a thread each.
+
+For 1 to 32 hosts, reports:
+- start-up: wall-clock seconds from start until every host's project is known (real time, real threads);
+- change-to-presence latency for timeline switches spread over the hosts (virtual time, an hour);
+- polls per minute and CPU milliseconds per simulated hour (virtual time).
+
+    python3 bench/multihost.py [max hosts]
+"""
+import contextlib
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "tests"))
+from fakes import Simulation  # noqa: E402
+
+CONNECT_LATENCY = 0.2
+CALL_LATENCY = 0.05
+CHANGES = 30
+
+
+def make_sim(hosts, real_time):
+    addresses = (None,) + tuple(f"10.0.0.{i}" for i in range(2, hosts + 1))
+    sim = Simulation(discord_ipc=True, resolve_hosts=addresses, resolve_latency=CALL_LATENCY,
+                     resolve_connect_latency=CONNECT_LATENCY, real_time=real_time)
+    for i, address in enumerate(addresses):
+        sim.resolves[address].open_project(f"Project {i}")
+    return sim, addresses
+
+
+def startup(hosts):
+    sim, _ = make_sim(hosts, real_time=True)
+    sim.start()
+    while any(host.project_state is None for host in sim.monitor.resolve_hosts) and sim.now - sim.started < 30:
+        sim.advance(0.005)
+    elapsed = sim.now - sim.started
+    sim.stop()
+    return elapsed
+
+
+def steady_state(hosts):
+    sim, addresses = make_sim(hosts, real_time=False)
+    sim.start()
+    sim.advance(60)
+    for i in range(CHANGES):
+        sim.resolves[addresses[i % hosts]].switch_timeline(f"Cut {i}")
+        sim.expect(f"Editing: Cut {i}")
+        sim.advance(3600 / CHANGES)
+    sim.stop()
+    return sim.report()
+
+
+def main():
+    max_hosts = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+    print(f"Hosts connecting in {CONNECT_LATENCY * 1000:g} ms, answering each call in {CALL_LATENCY * 1000:g} ms")
+    print(f"{'hosts':>5s} {'start-up ms':>11s} {'latency med/max s':>17s} {'polls/min':>9s} {'CPU ms/h':>9s}")
+    hosts = 1
+    while hosts <= max_hosts:
+        with open(os.devnull, "w") as log, contextlib.redirect_stdout(log):  # The monitor's own log
+            elapsed = startup(hosts)
+            report = steady_state(hosts)
+        polls_per_minute = report["polls"] / (report["simulated_hours"] * 60)
+        print(f"{hosts:5d} {elapsed * 1000:11.0f} {report['latency_median']:8.1f}/{report['latency_max']:<8.1f} "
+              f"{polls_per_minute:9.1f} {report['cpu_ms_per_hour']:9.0f}")
+        hosts *= 2
+
+
+if __name__ == "__main__":
+    main()
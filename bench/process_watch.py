@@ -0,0 +1,62 @@
+"""
+Process checks over a synthetic process table: the original full scan per check against ProcessWatcher.
+
+Simulates an hour of checks (both Discord and Resolve every TICK seconds, Resolve restarting every
+RESTART_EVERY seconds) and reports process table scans per hour, entries walked and CPU time per tick.
+
+    python3 bench/process_watch.py [background processes]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "tests"))
+from fakes import FakeProcessTable  # noqa: E402
+import resolve_rich_presence as rrp  # noqa: E402
+
+HOUR = 3600
+TICK = 2.0
+RESTART_EVERY = 600
+
+
+def naive_is_running(table, name):
+    """The check before ProcessWatcher: a substring match over the whole table on every call."""
+    for proc in table.process_iter(["pid", "name"]):
+        if name.lower() in proc.info["name"].lower():
+            return True
+    return False
+
+
+def run(table, check):
+    ticks = int(HOUR / TICK)
+    started = time.process_time()
+    for tick in range(ticks):
+        if tick and tick % int(RESTART_EVERY / TICK) == 0:
+            table.kill("Resolve")
+        elif tick % int(RESTART_EVERY / TICK) == 1:
+            table.start("Resolve")
+        check("discord")
+        check("resolve")
+    return ticks, time.process_time() - started
+
+
+def main():
+    background = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    print(f"{background} background processes, checks every {TICK:g}s, Resolve restarting every {RESTART_EVERY}s")
+
+    table = FakeProcessTable(background)
+    table.start("Discord")
+    ticks, cpu = run(table, lambda name: naive_is_running(table, name))
+    print(f"full scan per check: {table.scans:6d} scans/h, {table.entries:9d} entries walked, "
+          f"{cpu / ticks * 1e6:7.1f} us CPU per tick")
+
+    table = FakeProcessTable(background)
+    table.start("Discord")
+    watcher = rrp.ProcessWatcher(psutil_module=table, min_interval=0)
+    ticks, cpu = run(table, watcher.is_running)
+    print(f"ProcessWatcher:      {table.scans:6d} scans/h, {table.entries:9d} entries walked, "
+          f"{cpu / ticks * 1e6:7.1f} us CPU per tick ({table.lookups} liveness checks)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Runs the monitor through the scripted scenarios of tests/scenarios.py on fake backends and a virtual
+clock (the real DiscordIPC client against a fake Discord IPC server, a fake Resolve answering every call
+after RESOLVE_LATENCY), and reports per scenario:
+CPU time per simulated hour, Resolve API calls per poll, timer wake-ups per hour, presence writes,
+change-to-presence latency (from each scripted change to Discord showing it) and reconnects.
+
+    python3 bench/simulate.py [scenario ...] [--resolve-latency MS]
+"""
+import argparse
+import contextlib
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "tests"))
+from fakes import Simulation  # noqa: E402
+from scenarios import SCENARIOS  # noqa: E402
+
+
+def run(scenario, resolve_latency):
+    sim = Simulation(discord_ipc=True, resolve_latency=resolve_latency)
+    with open(os.devnull, "w") as log, contextlib.redirect_stdout(log):  # The monitor's own log
+        sim.start()
+        SCENARIOS[scenario](sim)
+        sim.stop()
+    return sim.report()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("scenarios", nargs="*", help=f"any of {', '.join(SCENARIOS)} (default: all)")
+    parser.add_argument("--resolve-latency", type=float, default=5, help="milliseconds per Resolve call")
+    args = parser.parse_args()
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+    args.scenarios = args.scenarios or list(SCENARIOS)
+
+    print(f"Resolve answering every call after {args.resolve_latency:g} ms")
+    print(f"{'scenario':20s} {'sim h':>6s} {'CPU ms/h':>9s} {'calls/poll':>10s} {'wake/h':>7s} {'writes':>6s} "
+          f"{'latency med/max s':>17s} {'shown':>6s}  reconnects")
+    for scenario in args.scenarios:
+        report = run(scenario, args.resolve_latency / 1000)
+        latency = "-" if report["latency_median"] is None else \
+            f"{report['latency_median']:.1f}/{report['latency_max']:.1f}"
+        reconnects = ", ".join(f"{link} {count}" for link, count in report["reconnects"].items())
+        print(f"{scenario:20s} {report['simulated_hours']:6.2f} {report['cpu_ms_per_hour']:9.1f} "
+              f"{report['api_calls_per_tick']:10.2f} {report['wakeups_per_hour']:7.0f} {report['presence_writes']:6d} "
+              f"{latency:>17s} {report['changes_shown']:>6s}  {reconnects}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Soak test: runs the monitor on a virtual clock through thousands of reconnect cycles (the flapping
+scenario of tests/scenarios.py: Resolve crashing or going stale, Discord dropping or quitting, every
+cycle) with a MemoryTracker checking retained memory every MEMORY_CHECK_INTERVAL, as --trace-memory does.
+
+Exits with status 1 if retained memory grew past the limit, at any check or at the end.
+
+    python3 bench/soak.py [--cycles N] [--every SECONDS] [--limit-kib KIB]
+"""
+import argparse
+import contextlib
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "tests"))
+from fakes import Simulation  # noqa: E402
+from scenarios import flapping  # noqa: E402
+import resolve_rich_presence as rrp  # noqa: E402
+
+
+class SoakTracker(rrp.MemoryTracker):
+    """MemoryTracker that also keeps the largest growth any check saw."""
+    peak = 0
+
+    def check(self):
+        within_limit = super().check()
+        self.peak = max(self.peak, self.growth)
+        return within_limit
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cycles", type=int, default=2000, help="reconnect cycles (default: 2000)")
+    parser.add_argument("--every", type=float, default=30.0, help="simulated seconds per cycle (default: 30)")
+    parser.add_argument("--limit-kib", type=float, default=rrp.MEMORY_GROWTH_LIMIT / 1024,
+                        help=f"retained memory growth limit (default: {rrp.MEMORY_GROWTH_LIMIT // 1024})")
+    args = parser.parse_args()
+
+    tracker = SoakTracker(limit=args.limit_kib * 1024)
+    sim = Simulation(discord_ipc=True, memory_tracker=tracker)
+    started = time.perf_counter()
+    with open(os.devnull, "w") as log, contextlib.redirect_stdout(log):  # The monitor's own log
+        sim.start()
+        flapping(sim, cycles=args.cycles, every=args.every)
+    elapsed = time.perf_counter() - started
+
+    reconnects = ", ".join(f"{link} {count}" for link, count in sim.reconnects().items())
+    print(f"{args.cycles} cycles, {sim.now / 3600:.1f} simulated hours in {elapsed:.1f}s; reconnects: {reconnects}")
+    within_limit = tracker.check()  # Prints the growth since the baseline and where it was allocated
+    with open(os.devnull, "w") as log, contextlib.redirect_stdout(log):
+        sim.stop()
+    if sim.monitor.metrics.errors["memory_growth"] or not within_limit:
+        print(f"FAIL: retained memory grew by up to {tracker.peak / 1024:.0f} KiB, "
+              f"over the {args.limit_kib:g} KiB limit.")
+        return 1
+    print(f"OK: retained memory grew by up to {tracker.peak / 1024:.0f} KiB.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+"""
+Start-up cost of the headless monitor:
+- import time of resolve_rich_presence from `python -X importtime` (cumulative, and the slowest modules
+  by their own import time), next to the bare interpreter's start-up;
+- a real headless launch (resolve_rich_presence.py --headless) against a FakeDiscordServer and a stand-in
+  process named Discord: time from the launch to the first supervisor tick and to the Discord handshake,
+  the first tick as the monitor reports it (from its own import), and the resident set size.
+
+    python3 bench/startup.py [runs]
+"""
+import asyncio
+import os
+import shutil
+import signal
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "tests"))
+from fakes import FakeDiscordServer  # noqa: E402
+import resolve_rich_presence as rrp  # noqa: E402
+
+REPO = os.path.dirname(os.path.abspath(rrp.__file__))
+SCRIPT = os.path.join(REPO, "resolve_rich_presence.py")
+SLOWEST = 5
+LAUNCH_TIMEOUT = 30.0
+
+
+def interpreter_startup():
+    """Wall-clock seconds of `python -c pass`."""
+    started = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "pass"], check=True)
+    return time.perf_counter() - started
+
+
+def import_times():
+    """(cumulative seconds of importing resolve_rich_presence, [(own seconds, module)] of every import)."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import resolve_rich_presence"],
+                            cwd=REPO, capture_output=True, text=True, check=True)
+    total, modules = None, []
+    for line in result.stderr.splitlines():
+        fields = line.removeprefix("import time:").split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # The header, or anything else on stderr
+        own, cumulative, module = int(fields[0]) / 1e6, int(fields[1]) / 1e6, fields[2].strip()
+        modules.append((own, module))
+        if module == "resolve_rich_presence":
+            total = cumulative
+    return total, modules
+
+
+async def until(condition, timeout):
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        if time.perf_counter() > deadline:
+            raise TimeoutError("the monitor did not get there in time")
+        await asyncio.sleep(0.001)
+
+
+async def launch(directory):
+    """Launches the headless monitor once. Returns its timings (seconds) and RSS (bytes)."""
+    import psutil
+    server = await FakeDiscordServer(os.path.join(directory, "discord-ipc-0")).start()
+    started = time.perf_counter()
+    monitor = await asyncio.create_subprocess_exec(
+        sys.executable, SCRIPT, "--headless", "--no-time-log", "--control-socket",
+        os.path.join(directory, "control.sock"), env=dict(os.environ, XDG_RUNTIME_DIR=directory),
+        stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT)
+    try:
+        while True:
+            line = (await asyncio.wait_for(monitor.stdout.readline(), LAUNCH_TIMEOUT)).decode()
+            if not line:
+                raise RuntimeError("the monitor exited before its first tick")
+            if line.startswith("First tick"):
+                first_tick = time.perf_counter() - started
+                reported = float(line.split()[2]) / 1000
+                break
+        rss_first_tick = psutil.Process(monitor.pid).memory_info().rss
+        await until(lambda: server.connects, LAUNCH_TIMEOUT)
+        discord = time.perf_counter() - started
+        await asyncio.sleep(1.0)  # Settled: both links polled at least once
+        rss_settled = psutil.Process(monitor.pid).memory_info().rss
+    finally:
+        if monitor.returncode is None:
+            monitor.send_signal(signal.SIGTERM)
+        await monitor.communicate()
+        server.close()
+    return {"first_tick": first_tick, "reported": reported, "discord": discord,
+            "rss_first_tick": rss_first_tick, "rss_settled": rss_settled}
+
+
+def launches(runs):
+    # A short directory: Unix socket paths are limited to about 100 bytes
+    with tempfile.TemporaryDirectory(dir="/tmp") as directory:
+        discord = os.path.join(directory, "Discord")  # So the process watcher finds Discord running
+        os.symlink(shutil.which("sleep"), discord)
+        stand_in = subprocess.Popen([discord, "3600"])
+        try:
+            return [asyncio.run(launch(directory)) for _ in range(runs)]
+        finally:
+            stand_in.kill()
+            stand_in.wait()
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    interpreter = statistics.median(interpreter_startup() for _ in range(runs))
+    imports = [import_times() for _ in range(runs)]
+    total = statistics.median(total for total, _ in imports)
+    _, modules = min(imports, key=lambda run: abs(run[0] - total))  # The median run
+    print(f"Median of {runs} runs")
+    print(f"{'Interpreter start-up (python -c pass)':40s} {interpreter * 1000:6.1f} ms")
+    print(f"{'Import of resolve_rich_presence':40s} {total * 1000:6.1f} ms, slowest modules:")
+    for own, module in sorted(modules, reverse=True)[:SLOWEST]:
+        print(f"  {own * 1000:6.1f} ms  {module}")
+
+    results = launches(runs)
+
+    def median(key):
+        return statistics.median(result[key] for result in results)
+    print("Headless launch:")
+    print(f"{'  first tick, from the launch':40s} {median('first_tick') * 1000:6.1f} ms")
+    print(f"{'  first tick, as reported (from import)':40s} {median('reported') * 1000:6.1f} ms")
+    print(f"{'  Discord handshake, from the launch':40s} {median('discord') * 1000:6.1f} ms")
+    print(f"{'  RSS at the first tick / settled':40s} {median('rss_first_tick') / 2**20:6.1f} / "
+          f"{median('rss_settled') / 2**20:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,103 +1,1096 @@
 import time
+# When this module started importing, for the time-to-first-tick report. Not the process start: the
+# interpreter's own start-up comes before it (bench/startup.py measures from the launch)
+_IMPORT_STARTED = time.perf_counter()
 import sys
-import psutil
-import rumps  # For macOS menu bar app
+import os
+import select
+import argparse
+import signal
 import threading  # For background tasks
+import asyncio  # Supervisor tasks for the Discord/Resolve links
+import enum
+import json
+import struct
+import itertools
+import random
+import collections
+import queue
+import concurrent.futures
+import contextlib
+import bisect
+import math
+import gc
+import tracemalloc
+import datetime
+import fcntl
+import socket
+import tempfile
 
-# Add Resolve API path if needed
-resolve_path = "/Library/Application Support/Blackmagic Design/DaVinci Resolve/Developer/Scripting/Modules"
-if resolve_path not in sys.path:
-    sys.path.append(resolve_path)
+# Heavy dependencies are imported on first use, so the headless monitor starts fast and the module
+# imports without the macOS GUI stack: psutil by ProcessWatcher, DaVinciResolveScript by
+# import_resolve_script(), rumps by the menu bar app (resolve_rpc_menubar).
 
-import DaVinciResolveScript as dvr
-from pypresence import Presence  # Ensure this is installed: pip3 install pypresence
+# Resolve's scripting API directory; RESOLVE_SCRIPT_API overrides it, as in Resolve's scripting README
+RESOLVE_SCRIPT_API = os.environ.get(
+    "RESOLVE_SCRIPT_API", "/Library/Application Support/Blackmagic Design/DaVinci Resolve/Developer/Scripting")
 
 # Discord Application ID
 DISCORD_CLIENT_ID = "1004088618857549844"
 
+# Seconds to wait for Discord to answer the IPC handshake
+DISCORD_HANDSHAKE_TIMEOUT = 5.0
+# Unsent bytes after which a Discord that stopped reading counts as dead
+DISCORD_MAX_WRITE_BUFFER = 64 * 1024
+
+# Exact process names (case-insensitive) for each watched target.
+# Whole-name matching keeps e.g. "Discord Helper" or an unrelated "resolved" daemon from counting.
+PROCESS_NAMES = {
+    "discord": ("Discord", "Discord PTB", "Discord Canary"),
+    "resolve": ("Resolve", "DaVinci Resolve"),
+}
+
+# Discord accepts at most this many activity updates per window (seconds) from one client
+PRESENCE_RATE_LIMIT = 5
+PRESENCE_RATE_WINDOW = 20.0
+
+# Resolve polling cadence (seconds): polls speed up to the minimum right after a change,
+# then back off by the factor towards the ceiling while nothing changes
+POLL_INTERVAL_MIN = 2.0
+POLL_INTERVAL_MAX = 15.0  # Ceiling while a project is open
+POLL_INTERVAL_IDLE_MAX = 60.0  # Ceiling while no project is open
+POLL_BACKOFF_FACTOR = 1.5
+
+# Seconds between checks of a healthy Discord link (process exits wake the checks right away)
+# and between checks for a process that isn't running yet
+DISCORD_CHECK_INTERVAL = 15.0
+PROCESS_START_POLL_INTERVAL = 5.0
+PROCESS_START_POLL_INTERVAL_OBSERVED = 60.0  # While launches are reported as they happen (watch_app_launches())
+
+# Extra presence details, sampled on the polls that fall due: seconds between samples of each field
+# ("render" checks whether a render runs, "render_progress" follows a running one; a timeline's frame rate
+# and duration are read once per timeline), and the scripting calls each field may cost a poll, on average
+SAMPLE_INTERVALS = {"page": 10.0, "render": 15.0, "render_progress": 5.0, "timeline": float("inf"), "timecode": 15.0}
+SAMPLE_CALL_BUDGETS = {"page": 1.0, "render": 1.5, "timeline": 3.0, "timecode": 1.0}
+
+# What the presence says the user is doing on each Resolve page
+PAGE_ACTIVITIES = {
+    "media": "Organizing media", "cut": "Cutting", "edit": "Editing", "fusion": "Compositing",
+    "color": "Grading", "fairlight": "Mixing audio", "deliver": "Delivering",
+}
+
+# Upper bounds (seconds) of the buckets of the per-phase timing histograms
+METRICS_BUCKETS = (0.001, 0.005, 0.025, 0.1, 0.5, 2.5, 10.0, 60.0, 300.0)
+
+# Memory tracing (--trace-memory): seconds between snapshots, and the growth in retained memory
+# (bytes) over the first snapshot that counts as a leak
+MEMORY_CHECK_INTERVAL = 600.0
+MEMORY_GROWTH_LIMIT = 8 * 2**20
+
+# Editing time log: where the event log and its aggregates live, seconds between batched writes, between
+# fsyncs and between compactions, and the gap in observations (seconds) that counts as not editing
+# (shorter gaps, e.g. a reconnect, resume the elapsed time shown in the presence)
+TIME_LOG_DIR = os.path.expanduser("~/Library/Application Support/ResolveRPC")
+TIME_LOG_FLUSH_INTERVAL = 30.0
+TIME_LOG_FSYNC_INTERVAL = 300.0
+TIME_LOG_COMPACT_INTERVAL = 3600.0
+TIME_LOG_IDLE_GAP = 300.0
+
+# Control socket of the running instance (its lock file is the same path + ".lock"), the seconds a later
+# launch waits for it to answer, and the commands it takes
+CONTROL_SOCKET_PATH = os.path.join(tempfile.gettempdir(), f"resolverpc-{os.getuid()}.sock")
+CONTROL_TIMEOUT = 5.0
+CONTROL_COMMANDS = ("status", "reconnect-discord", "reconnect-resolve", "quit")
+
+# Timers may fire up to this fraction of their delay late (capped, in seconds),
+# so timers falling due close together share one wake-up
+TIMER_SLACK = 0.1
+TIMER_SLACK_MAX = 1.0
+
+# Reconnect backoff (seconds): doubles with every consecutive failure up to the cap,
+# with up to RECONNECT_JITTER of each delay taken off at random
+RECONNECT_BASE_DELAY = 1.0
+RECONNECT_MAX_DELAY = 120.0
+RECONNECT_JITTER = 0.5
+
+# Deadlines (seconds) for Resolve scripting calls. A call that misses its deadline means "Resolve busy".
+RESOLVE_CALL_DEADLINE = 5.0
+RESOLVE_CONNECT_DEADLINE = 10.0
+
 # --- Helper Functions ---
-def is_process_running(process_name):
-    for proc in psutil.process_iter(['pid', 'name']):
-        if process_name.lower() in proc.info['name'].lower():
+class AdaptivePoller:
+    """
+    Decides how long to wait before the next get_project_info() poll.
+    observe() is fed the polled state and returns the next interval; kick() resets to the fastest
+    cadence on process-level events (e.g. Resolve just connected).
+    Also measures the effective poll rate and the change-to-presence latency, taken from the last
+    poll that still saw the old state to the presence send. The change happened after that poll, so
+    the poll time is a lower bound on the change time and the measured latency an upper bound.
+    """
+    def __init__(self, min_interval=POLL_INTERVAL_MIN, max_interval=POLL_INTERVAL_MAX,
+                 idle_max_interval=POLL_INTERVAL_IDLE_MAX, factor=POLL_BACKOFF_FACTOR, clock=time.monotonic):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.idle_max_interval = idle_max_interval
+        self.factor = factor
+        self._clock = clock
+        self.interval = min_interval
+        self._state = None
+        self._has_state = False
+        self._last_poll = None
+        self._change_since = None  # Set while a detected change hasn't reached the presence yet
+        self._polls = collections.deque(maxlen=20)  # Recent poll times, for the effective rate
+        self.last_latency = None
+
+    def kick(self):
+        self.interval = self.min_interval
+        self._last_poll = None  # A poll from before a reconnect says nothing about when the next change happened
+
+    def observe(self, state, idle=False):
+        now = self._clock()
+        self._polls.append(now)
+        if not self._has_state or state != self._state:
+            self._change_since = self._last_poll if self._last_poll is not None else now
+            self._state = state
+            self._has_state = True
+            self.interval = self.min_interval
+        else:
+            ceiling = self.idle_max_interval if idle else self.max_interval
+            self.interval = min(self.interval * self.factor, ceiling)
+        self._last_poll = now
+        return self.interval
+
+    def presence_sent(self):
+        """
+        Records that the presence now reflects the last observed state. Returns the change-to-presence
+        latency, None if no observed change was waiting for this send.
+        """
+        if self._change_since is None:
+            return None
+        self.last_latency = self._clock() - self._change_since
+        self._change_since = None
+        return self.last_latency
+
+    def poll_rate(self):
+        """Effective polls per minute over the recent polls."""
+        if len(self._polls) < 2 or self._polls[-1] == self._polls[0]:
+            return 0.0
+        return 60.0 * (len(self._polls) - 1) / (self._polls[-1] - self._polls[0])
+
+
+class PresenceScheduler:
+    """
+    Sits between the main loop and the Discord RPC client.
+    Payloads identical to the last one sent are skipped, a payload that has to wait for the rate limit
+    is replaced by newer ones (so bursts collapse into the latest state), and sends are kept under
+    Discord's rate limit with a token bucket.
+    A payload of None means "clear the presence".
+    """
+    _UNKNOWN = object()  # Presence state after a failed send
+
+    def __init__(self, rate=PRESENCE_RATE_LIMIT, per=PRESENCE_RATE_WINDOW, clock=time.monotonic):
+        self.rpc = None
+        self.capacity = rate
+        self.refill_per_second = rate / per
+        self._clock = clock
+        self._tokens = float(rate)
+        self._last_refill = clock()
+        self._last_sent = None
+        self._pending = None
+        self._has_pending = False
+        self._lock = threading.Lock()
+        # Counters
+        self.sent = 0
+        self.skipped = 0
+        self.coalesced = 0
+
+    def attach(self, rpc):
+        """Sends through a new RPC client (or none). A fresh connection starts with no presence."""
+        with self._lock:
+            self.rpc = rpc
+            self._last_sent = None
+            self._pending = None
+            self._has_pending = False
+
+    def update(self, **payload):
+        return self._submit(payload)
+
+    def clear(self):
+        return self._submit(None)
+
+    def _submit(self, payload):
+        with self._lock:
+            if not (self._has_pending and payload == self._pending):  # Else still waiting on the rate limit
+                if self._has_pending:
+                    # The waiting payload is superseded and will never be sent
+                    self.coalesced += 1
+                    self._pending = None
+                    self._has_pending = False
+                if payload == self._last_sent:
+                    self.skipped += 1
+                    return False
+                self._pending = payload
+                self._has_pending = True
+        return self.flush()
+
+    def _refill(self):
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last_refill) * self.refill_per_second)
+        self._last_refill = now
+
+    def retry_after(self):
+        """Seconds until the pending payload can be sent, or None if nothing is waiting."""
+        with self._lock:
+            if not self._has_pending:
+                return None
+            self._refill()
+            return max(0.0, (1 - self._tokens) / self.refill_per_second)
+
+    def flush(self):
+        """
+        Sends the pending payload if the rate limit allows it. Returns True if something was sent.
+        Errors from the RPC client are re-raised; the presence state is then treated as unknown.
+        """
+        with self._lock:
+            if not self._has_pending or self.rpc is None:
+                return False
+            self._refill()
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            payload = self._pending
+            self._pending = None
+            self._has_pending = False
+            try:
+                if payload is None:
+                    self.rpc.clear()
+                else:
+                    self.rpc.update(**payload)
+            except Exception:
+                self._last_sent = self._UNKNOWN
+                raise
+            self._last_sent = payload
+            self.sent += 1
             return True
-    return False
 
-def _wait_for_process_blocking(process_name, status_callback=None, app_running_flag=None):
+
+def discord_ipc_paths():
+    """Candidate Discord IPC socket paths, in the order Discord picks them."""
+    base = (os.environ.get("XDG_RUNTIME_DIR") or os.environ.get("TMPDIR") or os.environ.get("TMP")
+            or os.environ.get("TEMP") or "/tmp")
+    for subdir in ("", "app/com.discordapp.Discord", "snap.discord"):  # Plain, Flatpak, Snap
+        for i in range(10):
+            yield os.path.join(base, subdir, f"discord-ipc-{i}")
+
+
+class DiscordIPC:
     """
-    Waits for a process to start.
-    status_callback: Function to update GUI status.
-    app_running_flag: threading.Event or similar to check if app should still be running.
-    Returns True if process started, False if waiting was interrupted by app_running_flag.
+    Minimal Discord RPC client for the local discord-ipc-N socket, running on the supervisor's event loop.
+    Keeps one persistent connection. update()/clear() write a SET_ACTIVITY frame without waiting for the
+    reply; a reader task matches replies to their nonces and notices the socket dying (EOF, CLOSE frame)
+    as soon as it happens, calling on_closed(client).
+    paths: the socket paths to try, in order (default: discord_ipc_paths()).
     """
-    if status_callback:
-        status_callback(f"Waiting for {process_name}...")
-    print(f"Waiting for {process_name} to start...")
-    while not is_process_running(process_name):
-        if app_running_flag and not app_running_flag.is_set(): # Check if we should stop waiting
-            print(f"Stopped waiting for {process_name} as application is shutting down.")
+    OP_HANDSHAKE, OP_FRAME, OP_CLOSE, OP_PING, OP_PONG = range(5)
+    HEADER = struct.Struct("<II")
+
+    def __init__(self, client_id, on_closed=None, paths=None):
+        self.client_id = client_id
+        self.on_closed = on_closed
+        self.paths = paths
+        self._reader = None
+        self._writer = None
+        self._reader_task = None
+        self._nonces = itertools.count()
+        self._unacked = {}  # nonce -> send time
+        self.connected = False
+        # Counters
+        self.sent = 0
+        self.acked = 0
+        self.errors = 0
+        self.last_ack_latency = None
+
+    async def connect(self, timeout=DISCORD_HANDSHAKE_TIMEOUT):
+        for path in self.paths or discord_ipc_paths():
+            if not os.path.exists(path):
+                continue
+            try:
+                self._reader, self._writer = await asyncio.wait_for(asyncio.open_unix_connection(path), timeout)
+            except (OSError, asyncio.TimeoutError):
+                continue
+            try:
+                self._write(self.OP_HANDSHAKE, {"v": 1, "client_id": self.client_id})
+                op, reply = await asyncio.wait_for(self._read_frame(), timeout)
+            except (OSError, ValueError, asyncio.IncompleteReadError, asyncio.TimeoutError) as e:
+                self._writer.close()
+                raise ConnectionError(f"Discord IPC handshake failed: {type(e).__name__} - {e}") from e
+            if op == self.OP_CLOSE or reply.get("evt") != "READY":
+                self._writer.close()
+                raise ConnectionError(f"Discord refused the handshake: {reply.get('message', reply)}")
+            self.connected = True
+            self._reader_task = asyncio.ensure_future(self._read_loop())
+            return
+        raise ConnectionError("No Discord IPC socket found.")
+
+    def _write(self, op, payload):
+        data = json.dumps(payload, separators=(",", ":")).encode()
+        # A fresh bytes object: since Python 3.12 the transport queues what it can't send right away
+        # without copying it, so a reused buffer would overwrite frames still waiting to go out
+        self._writer.write(self.HEADER.pack(op, len(data)) + data)
+
+    async def _read_frame(self):
+        op, length = self.HEADER.unpack(await self._reader.readexactly(self.HEADER.size))
+        return op, json.loads(await self._reader.readexactly(length))
+
+    async def _read_loop(self):
+        try:
+            while True:
+                op, payload = await self._read_frame()
+                if op == self.OP_PING:
+                    self._write(self.OP_PONG, payload)
+                elif op == self.OP_CLOSE:
+                    print(f"Discord closed the IPC connection: {payload.get('message', payload)}")
+                    break
+                elif op == self.OP_FRAME:
+                    sent_at = self._unacked.pop(payload.get("nonce"), None)
+                    if sent_at is not None:
+                        self.acked += 1
+                        self.last_ack_latency = time.monotonic() - sent_at
+                    if payload.get("evt") == "ERROR":
+                        self.errors += 1
+                        print(f"Discord rejected {payload.get('cmd')}: {payload.get('data')}")
+        except (OSError, ValueError, asyncio.IncompleteReadError):
+            pass  # Socket died
+        self.connected = False
+        on_closed = self.on_closed
+        self._release()
+        if on_closed:
+            on_closed(self)
+
+    def _release(self):
+        """Closes the socket and drops everything a dead client would otherwise keep alive."""
+        if self._writer:
+            self._writer.close()
+        self._reader = self._writer = self._reader_task = None
+        self._unacked.clear()
+        self.on_closed = None
+
+    def set_activity(self, activity):
+        if not self.connected:
+            raise ConnectionError("Discord IPC connection is closed.")
+        if self._writer.transport.get_write_buffer_size() > DISCORD_MAX_WRITE_BUFFER:
+            raise ConnectionError("Discord stopped reading from the IPC connection.")
+        nonce = str(next(self._nonces))
+        self._write(self.OP_FRAME, {"cmd": "SET_ACTIVITY", "nonce": nonce,
+                                    "args": {"pid": os.getpid(), "activity": activity}})
+        self._unacked[nonce] = time.monotonic()
+        if len(self._unacked) > 100:  # Discord doesn't answer every frame when it's struggling
+            self._unacked.pop(next(iter(self._unacked)))
+        self.sent += 1
+
+    def update(self, state=None, details=None, start=None, large_image=None, large_text=None):
+        """Same keywords as pypresence's Presence.update() for the fields this app uses."""
+        activity = {"state": state, "details": details}
+        if start is not None:
+            activity["timestamps"] = {"start": start}
+        if large_image is not None or large_text is not None:
+            activity["assets"] = {"large_image": large_image, "large_text": large_text}
+        self.set_activity({key: value for key, value in activity.items() if value is not None})
+
+    def clear(self):
+        self.set_activity(None)
+
+    def close(self):
+        """Closes the socket once buffered frames are flushed; on_closed is not called."""
+        self.connected = False
+        if self._reader_task:
+            self._reader_task.cancel()
+        self._release()
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus style."""
+    def __init__(self, buckets=METRICS_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Last one is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Metrics:
+    """Low-overhead per-phase timing histograms and error counters, rendered in Prometheus text format."""
+    def __init__(self):
+        self.phases = {}  # phase -> Histogram
+        self.errors = collections.Counter()  # kind -> count
+
+    @contextlib.contextmanager
+    def time(self, phase):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            histogram = self.phases.get(phase)
+            if histogram is None:
+                histogram = self.phases[phase] = Histogram()
+            histogram.observe(time.perf_counter() - start)
+
+    def error(self, kind):
+        self.errors[kind] += 1
+
+    def render(self):
+        lines = ["# HELP resolverpc_phase_seconds Time spent in each phase of the monitor loop.",
+                 "# TYPE resolverpc_phase_seconds histogram"]
+        for phase, histogram in sorted(self.phases.items()):
+            cumulative = 0
+            for bound, count in zip(histogram.buckets + (float("inf"),), histogram.counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'resolverpc_phase_seconds_bucket{{phase="{phase}",le="{le}"}} {cumulative}')
+            lines.append(f'resolverpc_phase_seconds_sum{{phase="{phase}"}} {histogram.sum:.6f}')
+            lines.append(f'resolverpc_phase_seconds_count{{phase="{phase}"}} {histogram.count}')
+        lines += ["# HELP resolverpc_errors_total Errors by kind.", "# TYPE resolverpc_errors_total counter"]
+        for kind, count in sorted(self.errors.items()):
+            lines.append(f'resolverpc_errors_total{{kind="{kind}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+
+class MemoryTracker:
+    """
+    Watches retained memory with tracemalloc. The first check() takes the baseline (after start-up has
+    settled); later ones compare against it and report the allocation sites that grew the most.
+    """
+    def __init__(self, limit=MEMORY_GROWTH_LIMIT, frames=1, top=10):
+        self.limit = limit
+        self.frames = frames
+        self.top = top
+        self._baseline = None
+        self.growth = 0
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+
+    def _snapshot(self):
+        gc.collect()  # Only count what is really retained
+        return tracemalloc.take_snapshot().filter_traces((tracemalloc.Filter(False, tracemalloc.__file__),))
+
+    def check(self):
+        """Returns True while retained memory growth stays within the limit."""
+        snapshot = self._snapshot()
+        if self._baseline is None:
+            self._baseline = snapshot
+            return True
+        stats = snapshot.compare_to(self._baseline, "lineno")
+        self.growth = sum(stat.size_diff for stat in stats)
+        within_limit = self.growth <= self.limit
+        print(f"Retained memory {'grew' if self.growth >= 0 else 'shrank'} by {abs(self.growth) / 1024:.0f} KiB "
+              f"since the baseline{'' if within_limit else f', over the {self.limit / 1024:.0f} KiB limit'}.")
+        for stat in stats[:self.top]:
+            if stat.size_diff > 0:
+                print(f"  {stat}")
+        return within_limit
+
+
+class TimerScheduler:
+    """
+    The one timer behind every sleep and delayed call of the supervisor tasks.
+    Each timer may fire up to its slack late, so timers falling due close together are coalesced
+    into a single wake-up; otherwise the event loop sleeps exactly until the next due timer.
+    """
+    def __init__(self, loop, slack=TIMER_SLACK, max_slack=TIMER_SLACK_MAX):
+        self._loop = loop
+        self.slack = slack
+        self.max_slack = max_slack
+        self._timers = []  # [latest fire time, due time, callback]
+        self._handle = None
+        self.wakeups = 0
+
+    def call_later(self, delay, callback):
+        """Calls callback after delay seconds (give or take the slack). Returns a handle for cancel()."""
+        due = self._loop.time() + max(0.0, delay)
+        timer = [due + min(delay * self.slack, self.max_slack), due, callback]
+        self._timers.append(timer)
+        self._arm()
+        return timer
+
+    def cancel(self, timer):
+        timer[2] = None  # Dropped at the next wake-up
+
+    def _arm(self):
+        self._timers = [timer for timer in self._timers if timer[2] is not None]
+        if not self._timers:
+            return
+        fire_at = min(timer[0] for timer in self._timers)
+        if self._handle is not None:
+            if self._handle.when() <= fire_at:
+                return  # Already firing in time
+            self._handle.cancel()
+        self._handle = self._loop.call_at(fire_at, self._fire)
+
+    def _fire(self):
+        self._handle = None
+        self.wakeups += 1
+        now = self._loop.time()
+        due = [timer for timer in self._timers if timer[1] <= now and timer[2] is not None]
+        for timer in due:
+            self._timers.remove(timer)
+        self._arm()
+        for _, _, callback in due:
+            callback()
+
+    async def sleep(self, delay, wakeup=None):
+        """Sleeps for delay seconds, or until the asyncio event wakeup is set (it is cleared again)."""
+        done = self._loop.create_future()
+        timer = self.call_later(delay, lambda: done.done() or done.set_result(None))
+        waiter = asyncio.ensure_future(wakeup.wait()) if wakeup is not None else None
+        try:
+            await asyncio.wait([done] if waiter is None else [done, waiter], return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            self.cancel(timer)
+            if waiter is not None:
+                waiter.cancel()
+                wakeup.clear()
+
+
+class ExitNotifier:
+    """
+    Blocks until one of the given PIDs exits, wake() is called or the timeout passes.
+    This base class has no OS support and only waits for wake() or the timeout (polling fallback);
+    use make_exit_notifier() to get the best backend for this platform.
+    """
+    def __init__(self):
+        self._wake_r, self._wake_w = os.pipe()
+        os.set_blocking(self._wake_r, False)
+        os.set_blocking(self._wake_w, False)
+
+    def wake(self):
+        try:
+            os.write(self._wake_w, b"x")
+        except BlockingIOError:
+            pass  # Pipe full, a wake-up is already pending
+
+    def _drain_wake(self):
+        try:
+            while os.read(self._wake_r, 64):
+                pass
+        except BlockingIOError:
+            pass
+
+    def wait(self, pids, timeout):
+        """Returns True if woken or a process exited, False on timeout."""
+        readable, _, _ = select.select([self._wake_r], [], [], timeout)
+        self._drain_wake()
+        return bool(readable)
+
+
+class KqueueExitNotifier(ExitNotifier):
+    """macOS/BSD: exits are reported by kqueue EVFILT_PROC/NOTE_EXIT."""
+    def wait(self, pids, timeout):
+        kq = select.kqueue()
+        try:
+            changes = [select.kevent(self._wake_r, select.KQ_FILTER_READ, select.KQ_EV_ADD)]
+            for pid in pids:
+                changes.append(select.kevent(pid, select.KQ_FILTER_PROC,
+                                             select.KQ_EV_ADD | select.KQ_EV_ONESHOT, select.KQ_NOTE_EXIT))
+            # A PID that is already gone comes back as an EV_ERROR event, which counts as an exit
+            events = kq.control(changes, len(changes), timeout)
+        finally:
+            kq.close()
+        self._drain_wake()
+        return bool(events)
+
+
+class PidfdExitNotifier(ExitNotifier):
+    """Linux: a pidfd becomes readable when its process exits."""
+    def wait(self, pids, timeout):
+        poller = select.poll()
+        poller.register(self._wake_r, select.POLLIN)
+        pidfds = []
+        try:
+            for pid in pids:
+                try:
+                    pidfd = os.pidfd_open(pid)
+                except ProcessLookupError:
+                    return True  # Already gone
+                pidfds.append(pidfd)
+                poller.register(pidfd, select.POLLIN)
+            events = poller.poll(None if timeout is None else timeout * 1000)
+        finally:
+            for pidfd in pidfds:
+                os.close(pidfd)
+        self._drain_wake()
+        return bool(events)
+
+
+def make_exit_notifier():
+    if hasattr(select, "kqueue"):
+        return KqueueExitNotifier()
+    if hasattr(os, "pidfd_open"):
+        try:
+            os.close(os.pidfd_open(os.getpid()))
+            return PidfdExitNotifier()
+        except OSError:
+            pass  # Kernel without pidfd support
+    return ExitNotifier()
+
+
+class ProcessWatcher:
+    """
+    Tracks the PIDs of the watched processes instead of scanning the process table on every check.
+    Known PIDs are only checked for liveness (with create time, to catch PID reuse); a single
+    process table scan, shared by all targets, is done only while some target is missing.
+    min_interval: checks made within this many seconds of the last refresh reuse its result.
+    notifier: ExitNotifier used to block until a watched process exits (default: make_exit_notifier(),
+    created on first use, so merely constructing a watcher opens nothing).
+    psutil_module: stand-in for psutil (e.g. a fake process table); psutil itself is imported on first use.
+    """
+    def __init__(self, targets=None, min_interval=1.0, notifier=None, psutil_module=None):
+        self.targets = {}
+        for target, names in (targets or PROCESS_NAMES).items():
+            self.targets[target] = {name.lower() for name in names}
+        self.min_interval = min_interval
+        self._notifier = notifier
+        self._psutil = psutil_module
+        self._pids = {}  # target -> (pid, create_time)
+        self._last_refresh = None
+        self._lock = threading.Lock()
+        # Counters, useful to measure the cost of watching
+        self.scans = 0
+        self.liveness_checks = 0
+
+    @property
+    def notifier(self):
+        if self._notifier is None:
+            with self._lock:
+                if self._notifier is None:
+                    self._notifier = make_exit_notifier()
+        return self._notifier
+
+    @property
+    def psutil(self):
+        if self._psutil is None:
+            import psutil  # Only loaded once something is actually watched
+            self._psutil = psutil
+        return self._psutil
+
+    def _is_alive(self, pid, create_time):
+        self.liveness_checks += 1
+        try:
+            proc = self.psutil.Process(pid)
+            # An exited process its parent hasn't reaped yet keeps its entry, but is gone for our purposes
+            return proc.create_time() == create_time and proc.status() != self.psutil.STATUS_ZOMBIE
+        except (self.psutil.NoSuchProcess, self.psutil.AccessDenied, self.psutil.ZombieProcess):
             return False
-        time.sleep(5)
-    if status_callback:
-        status_callback(f"{process_name} started.")
-    print(f"{process_name} has started.")
-    return True
 
-def get_resolve_connection(status_callback=None, app_running_flag=None):
+    def _scan(self):
+        self.scans += 1
+        missing = {target: names for target, names in self.targets.items() if target not in self._pids}
+        found = False
+        for proc in self.psutil.process_iter(['pid', 'name', 'create_time', 'status']):
+            if proc.info['status'] == self.psutil.STATUS_ZOMBIE:
+                continue
+            name = (proc.info['name'] or "").lower()
+            for target, names in missing.items():
+                if name in names:
+                    self._pids[target] = (proc.info['pid'], proc.info['create_time'])
+                    del missing[target]
+                    found = True
+                    break
+            if not missing:
+                break
+        if found:
+            self.wake()  # Let a pending wait_for_exit() pick up the new PID
+
+    def refresh(self, force=False):
+        with self._lock:
+            now = time.monotonic()
+            if not force and self._last_refresh is not None and now - self._last_refresh < self.min_interval:
+                return
+            self._last_refresh = now
+            for target, (pid, create_time) in list(self._pids.items()):
+                if not self._is_alive(pid, create_time):
+                    del self._pids[target]
+            if len(self._pids) < len(self.targets):
+                self._scan()
+
+    def pid(self, target):
+        """Returns the cached PID of target, or None if it is not running."""
+        with self._lock:
+            if target not in self.targets:
+                # Unknown target: match the given name exactly
+                self.targets[target] = {target.lower()}
+                self._last_refresh = None
+        self.refresh()
+        entry = self._pids.get(target)
+        return entry[0] if entry else None
+
+    def is_running(self, target):
+        return self.pid(target) is not None
+
+    def wait_for_exit(self, timeout):
+        """
+        Blocks until a watched process exits, wake() is called or timeout passes.
+        Returns True only if a watched process exited; a wake() (e.g. for a new PID to watch) returns False.
+        Process starts can't be observed this way, so they are found by the next refresh (or, on macOS,
+        reported by observe_app_launches()).
+        """
+        notifier = self.notifier  # Exists before the PIDs are read, so a wake() for a new PID isn't lost
+        with self._lock:
+            pids = [pid for pid, _ in self._pids.values()]
+        if not notifier.wait(pids, timeout):
+            return False
+        self.refresh(force=True)
+        with self._lock:
+            alive = {pid for pid, _ in self._pids.values()}
+        return any(pid not in alive for pid in pids)
+
+    def invalidate(self):
+        """Makes the next check refresh instead of reusing the last result, e.g. after hearing of a launch."""
+        with self._lock:
+            self._last_refresh = None
+
+    def wake(self):
+        if self._notifier is not None:  # Else nothing is waiting yet
+            self._notifier.wake()
+
+
+process_watcher = ProcessWatcher()  # Cheap: psutil and the exit notifier are only set up on first use
+
+
+def observe_app_launches(callback):
+    """
+    macOS: calls callback(name, ...) with the process and display names of every application that launches,
+    from NSWorkspace's launch notifications, so a start is seen at once rather than at the next
+    PROCESS_START_POLL_INTERVAL check. The notifications come through the main thread's run loop, so this
+    needs one running (the menu bar app's). Returns the observer, to keep for as long as launches should be
+    reported; None without AppKit (pyobjc, installed with rumps).
+    """
+    try:
+        from AppKit import NSWorkspace, NSWorkspaceApplicationKey, NSWorkspaceDidLaunchApplicationNotification
+    except ImportError:
+        return None
+
+    def launched(notification):
+        app = notification.userInfo()[NSWorkspaceApplicationKey]
+        executable = app.executableURL()
+        callback(*(str(name) for name in (executable and executable.lastPathComponent(), app.localizedName())
+                   if name))
+
+    center = NSWorkspace.sharedWorkspace().notificationCenter()
+    return center.addObserverForName_object_queue_usingBlock_(
+        NSWorkspaceDidLaunchApplicationNotification, None, None, launched)
+
+def is_process_running(process_name):
+    return process_watcher.is_running(process_name)
+
+class ResolveBusyError(TimeoutError):
+    """A Resolve scripting call missed its deadline (Resolve is rendering, showing a modal dialog, ...)."""
+
+
+class ResolveCallExecutor:
     """
-    Connects to DaVinci Resolve, waiting if necessary.
-    Returns resolve object or None if connection fails or interrupted.
+    Runs Resolve scripting calls on one dedicated daemon thread, each with a deadline.
+    While a call is still running (hung), new calls fail fast with ResolveBusyError instead of
+    queueing behind it. Doubles as a watchdog: counts hung calls and keeps recent call latencies.
     """
-    if not _wait_for_process_blocking("resolve", status_callback, app_running_flag):
-        return None # Waiting was interrupted
+    def __init__(self, default_deadline=RESOLVE_CALL_DEADLINE, history=200):
+        self.default_deadline = default_deadline
+        self._jobs = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker = None
+        self._in_flight = None  # (future, start time) of the running call
+        self._closed = False
+        self._latencies = collections.deque(maxlen=history)
+        # Counters
+        self.calls = 0
+        self.hung_calls = 0
+        self.busy_rejections = 0
 
-    while app_running_flag is None or app_running_flag.is_set():
+    def call(self, fn, *args, deadline=None):
+        deadline = self.default_deadline if deadline is None else deadline
+        future = concurrent.futures.Future()
+        with self._lock:
+            if self._closed:
+                raise ResolveBusyError("Resolve call executor is shut down.")
+            if self._in_flight is not None:
+                self.busy_rejections += 1
+                running_for = time.monotonic() - self._in_flight[1]
+                raise ResolveBusyError(f"Resolve busy: previous call still running after {running_for:.1f}s.")
+            self._in_flight = (future, time.monotonic())
+            self.calls += 1
+            if self._worker is None:
+                # Daemon thread, so a stuck call never holds up interpreter exit
+                self._worker = threading.Thread(target=self._run, daemon=True)
+                self._worker.start()
+        self._jobs.put((fn, args, future))
         try:
-            resolve = dvr.scriptapp("Resolve")
-            if resolve:
-                if status_callback:
-                    status_callback("Resolve: Connected.")
-                print("Connected to DaVinci Resolve.")
-                return resolve
-        except Exception as e:
-            msg = f"Resolve: Connection failed: {str(e)[:50]}. Retrying..."
+            return future.result(timeout=deadline)
+        except ResolveBusyError:
+            raise  # Failed by shutdown()
+        except concurrent.futures.TimeoutError:
+            self.hung_calls += 1
+            name = getattr(fn, "__name__", repr(fn))
+            print(f"Resolve call {name}() missed its {deadline:g}s deadline (hung calls: {self.hung_calls}).")
+            raise ResolveBusyError(f"Resolve busy: {name}() did not return within {deadline:g}s.") from None
+
+    def _run(self):
+        while True:
+            fn, args, future = self._jobs.get()
+            start = time.monotonic()
+            try:
+                result = fn(*args)
+            except BaseException as e:
+                self._settle(future, exception=e)
+            else:
+                self._settle(future, result=result)
+            with self._lock:
+                self._latencies.append(time.monotonic() - start)
+                self._in_flight = None
+            # Don't keep the last call's arguments (e.g. a stale Resolve handle) alive until the next call
+            fn = args = future = result = None
+
+    @staticmethod
+    def _settle(future, result=None, exception=None):
+        try:
+            if exception is not None:
+                future.set_exception(exception)
+            else:
+                future.set_result(result)
+        except concurrent.futures.InvalidStateError:
+            pass  # Already failed by shutdown()
+
+    def latency_percentiles(self, percentiles=(50, 90, 99)):
+        """Returns {percentile: seconds} over the recent completed calls (empty if none)."""
+        with self._lock:
+            latencies = sorted(self._latencies)
+        if not latencies:
+            return {}
+        # Nearest rank: the smallest latency that at least p% of the calls took no longer than
+        return {p: latencies[max(0, math.ceil(len(latencies) * p / 100) - 1)] for p in percentiles}
+
+    def shutdown(self):
+        """Fails the running call (if any) right away and refuses new ones; never waits for Resolve."""
+        with self._lock:
+            self._closed = True
+            in_flight = self._in_flight
+        if in_flight is not None:
+            self._settle(in_flight[0], exception=ResolveBusyError("Shutting down."))
+
+
+resolve_executor = ResolveCallExecutor()
+
+def import_resolve_script():
+    """Imports Resolve's DaVinciResolveScript module, adding its directory to sys.path if needed."""
+    modules_path = os.path.join(RESOLVE_SCRIPT_API, "Modules")
+    if modules_path not in sys.path:
+        sys.path.append(modules_path)
+    import DaVinciResolveScript
+    return DaVinciResolveScript
+
+
+def get_resolve_connection(status_callback=None, executor=None, script=None, host=None):
+    """
+    Makes one attempt to connect to DaVinci Resolve.
+    Returns resolve object or None if the connection fails; retrying is up to the caller.
+    executor: ResolveCallExecutor to connect through (default: resolve_executor).
+    script: module providing scriptapp() (default: DaVinciResolveScript).
+    host: address of the workstation running Resolve (default: this machine).
+    """
+    executor = executor or resolve_executor
+    name = f"Resolve ({host})" if host else "Resolve"
+    try:
+        script = script or import_resolve_script()
+        args = ("Resolve", host) if host else ("Resolve",)
+        resolve = executor.call(script.scriptapp, *args, deadline=RESOLVE_CONNECT_DEADLINE)
+        if resolve:
             if status_callback:
-                status_callback(msg)
-            print(msg)
-            # Check flag before sleeping
-            for _ in range(5): # Sleep for 5 seconds, but check flag every second
-                if app_running_flag and not app_running_flag.is_set():
-                    return None
-                time.sleep(1)
-        if app_running_flag and not app_running_flag.is_set():
-            break # Exit loop if app is shutting down
+                status_callback(f"{name}: Connected.")
+            print(f"Connected to DaVinci Resolve{f' on {host}' if host else ''}.")
+            return resolve
+        msg = f"{name}: Not accepting scripting connections yet."
+    except Exception as e:
+        msg = f"{name}: Connection failed: {str(e)[:50]}."
+    if status_callback:
+        status_callback(msg)
+    print(msg)
     return None
 
 
-def get_project_info(resolve_api_object):
-    if not resolve_api_object:
-        # This case should ideally be caught before calling get_project_info
-        # by checking self.resolve in the main loop.
-        return None, None, None
-    try:
-        project_manager = resolve_api_object.GetProjectManager()
-        if not project_manager:
-            # If GetProjectManager returns None, the connection is likely stale or Resolve is not ready.
-            raise ConnectionError("GetProjectManager() returned None, connection likely stale.")
+class LinkState(enum.Enum):
+    ABSENT = "Absent"  # Process not running
+    STARTING = "Starting"  # Process running, connecting
+    CONNECTED = "Connected"
+    STALE = "Stale"  # An established connection went bad
+    BACKOFF = "Backoff"  # Waiting before the next connection attempt
+
+
+class Link:
+    """
+    Connection state machine for one side (Resolve or Discord).
+    Consecutive failures grow the reconnect delay exponentially, with jitter, up to max_delay; they are only
+    forgotten once the link proves healthy(), so a half-started app can't cause a tight reconnect loop.
+    """
+    def __init__(self, name, base_delay=RECONNECT_BASE_DELAY, max_delay=RECONNECT_MAX_DELAY,
+                 jitter=RECONNECT_JITTER, rng=random.random):
+        self.name = name
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self._rng = rng
+        self.state = LinkState.ABSENT
+        self.failures = 0  # Consecutive failures
+        self.transitions = collections.Counter()  # (from state, to state) -> count
+
+    def _set(self, state):
+        if state is not self.state:
+            self.transitions[(self.state, state)] += 1
+            print(f"{self.name}: {self.state.value} -> {state.value}")
+            self.state = state
+
+    def absent(self):
+        self.failures = 0
+        self._set(LinkState.ABSENT)
+
+    def starting(self):
+        self._set(LinkState.STARTING)
+
+    def connected(self):
+        self._set(LinkState.CONNECTED)
+
+    def healthy(self):
+        """The connection is doing real work fine: start over with the shortest backoff."""
+        self.failures = 0
+
+    def fail(self):
+        """A connection attempt failed, or an established connection went bad."""
+        self.failures += 1
+        self._set(LinkState.STALE if self.state is LinkState.CONNECTED else LinkState.BACKOFF)
+
+    def backoff(self):
+        """Enters Backoff and returns the number of seconds to wait before the next attempt."""
+        self._set(LinkState.BACKOFF)
+        delay = min(self.max_delay, self.base_delay * 2 ** max(0, self.failures - 1))
+        return delay * (1 - self.jitter * self._rng())
+
+
+class ResolveObjectCache:
+    """
+    Keeps the project manager, project and timeline handles of one Resolve connection between polls,
+    so a steady-state poll costs GetCurrentProject() + GetCurrentTimeline() instead of the full walk.
+    Names are only re-fetched when the project/timeline changes, and every name_refresh_polls polls to
+    pick up renames. Handles are told apart by their GetUniqueId(): two proxies for the same object
+    need not compare equal.
+    A failing call on a cached handle propagates so get_project_info() can turn it into a ConnectionError.
+    """
+    def __init__(self, resolve_api_object, name_refresh_polls=10):
+        self.resolve = resolve_api_object
+        self.name_refresh_polls = name_refresh_polls
+        self.api_calls = 0  # Scripting calls made through this cache
+        self.invalidate()
+
+    def invalidate(self):
+        self._project_manager = None
+        self._project = None
+        self._project_id = None
+        self._project_name = None
+        self._timeline = None
+        self._timeline_id = None
+        self._timeline_name = None
+        self._polls_since_names = 0
+
+    def _call(self, method):
+        self.api_calls += 1
+        return method()
+
+    def _object_id(self, handle, cached_handle, cached_id):
+        """The unique id of handle; asks Resolve only if handle doesn't compare equal to the cached one."""
+        if cached_handle is not None and handle == cached_handle:
+            return cached_id
+        get_unique_id = getattr(handle, "GetUniqueId", None)
+        object_id = self._call(get_unique_id) if get_unique_id is not None else None
+        return handle if object_id is None else object_id  # Without ids, the handle is all there is
+
+    @property
+    def timeline(self):
+        """The current timeline's handle as of the last poll, None if there is none."""
+        return self._timeline
+
+    @property
+    def timeline_id(self):
+        """The current timeline's unique id as of the last poll, None if there is none."""
+        return self._timeline_id
 
-        project = project_manager.GetCurrentProject()
+    def project_info(self):
+        project_manager = self._project_manager
+        cached_manager = project_manager is not None
+        if not cached_manager:
+            project_manager = self._call(self.resolve.GetProjectManager)
+            if not project_manager:
+                # If GetProjectManager returns None, the connection is likely stale or Resolve is not ready.
+                raise ConnectionError("GetProjectManager() returned None, connection likely stale.")
+            self._project_manager = project_manager
+
+        # Also revalidates the cached project manager: a stale handle fails here
+        project = self._call(project_manager.GetCurrentProject)
+        if not project and cached_manager and self._project is not None:
+            # The project just went away; confirm with a fresh handle in case ours went stale quietly
+            self._project_manager = None
+            return self.project_info()
         if not project:
             # This is a valid state: Resolve is open, but no project is currently open.
+            self.invalidate()
+            self._project_manager = project_manager
             return None, None, None
 
-        project_name = project.GetName()
-        # If a project object exists, its name should ideally not be None.
-        if project_name is None:
-            raise ConnectionError(f"project.GetName() returned None for an existing project object.")
+        self._polls_since_names += 1
+        refresh_names = self._polls_since_names >= self.name_refresh_polls
+        if refresh_names:
+            self._polls_since_names = 0
+
+        project_id = self._object_id(project, self._project, self._project_id)
+        if refresh_names or project_id != self._project_id:
+            project_name = self._call(project.GetName)
+            # If a project object exists, its name should ideally not be None.
+            if project_name is None:
+                raise ConnectionError(f"project.GetName() returned None for an existing project object.")
+            if project_id != self._project_id:
+                # Child handles belong to the previous project
+                self._timeline = self._timeline_id = self._timeline_name = None
+            self._project_name = project_name
+        self._project, self._project_id = project, project_id
+
+        timeline = self._call(project.GetCurrentTimeline)
+        if not timeline:
+            self._timeline = self._timeline_id = self._timeline_name = None
+            return project, self._project_name, None
+        timeline_id = self._object_id(timeline, self._timeline, self._timeline_id)
+        if refresh_names or timeline_id != self._timeline_id:
+            self._timeline_name = self._call(timeline.GetName)
+        self._timeline, self._timeline_id = timeline, timeline_id
+        return project, self._project_name, self._timeline_name
 
-        timeline = project.GetCurrentTimeline()
-        timeline_name = timeline.GetName() if timeline else None
-        return project, project_name, timeline_name
+
+def get_project_info(resolve_api_object, cache=None):
+    """
+    Returns (project, project_name, timeline_name) for the current Resolve project.
+    cache: ResolveObjectCache for resolve_api_object to reuse handles between calls; without it
+    every call walks the full object graph.
+    """
+    if not resolve_api_object:
+        # This case should ideally be caught before calling get_project_info
+        # by checking self.resolve in the main loop.
+        return None, None, None
+    if cache is None:
+        cache = ResolveObjectCache(resolve_api_object)
+    try:
+        return cache.project_info()
     except Exception as e:
+        cache.invalidate()  # Never hand out handles from a failed walk again
         # Wrap other potential API errors in ConnectionError if they are not already.
         if isinstance(e, ConnectionError):
             raise  # Re-raise if it's already the type we want
@@ -106,302 +1099,1237 @@ def get_project_info(resolve_api_object):
         raise ConnectionError(f"Resolve API call failed within get_project_info: {type(e).__name__} - {e}") from e
 
 
-class ResolveApp(rumps.App):
+class ResolveDetailSampler:
+    """
+    Samples the extra presence details of one connection incrementally, on top of get_project_info():
+    each field at its own cadence (SAMPLE_INTERVALS), render progress only while a render runs, and a
+    timeline's frame rate and duration once per timeline. Counts each field's scripting calls and warns
+    once if a field costs more than its SAMPLE_CALL_BUDGETS share per sample.
+    """
+    def __init__(self, intervals=SAMPLE_INTERVALS, budgets=SAMPLE_CALL_BUDGETS, clock=time.monotonic):
+        self.intervals = intervals
+        self.budgets = budgets
+        self.clock = clock
+        self.calls = collections.Counter()  # field -> scripting calls made
+        self.samples = collections.Counter()  # field -> samples taken
+        self.over_budget = set()  # Fields already warned about
+        self.reset()
+
+    def reset(self):
+        self.details = {}  # "page", "render" (percent done), "duration" (seconds) and "timecode"
+        self._due = {}  # field -> clock() time of its next sample
+        self._timeline_id = None
+        self._render_job = None  # JobId of the render in progress
+        self.rendering = False
+
+    def _sample(self, field, fn):
+        """Updates the details with fn(call) if field is due, counting the calls made through call(method, *args)."""
+        now = self.clock()
+        if now < self._due.get(field, now):
+            return
+        calls = 0
+        def call(method, *args):
+            nonlocal calls
+            calls += 1
+            return method(*args)
+        try:
+            self.details.update(fn(call))
+        finally:
+            self.calls[field] += calls
+            self.samples[field] += 1
+        interval_key = "render_progress" if field == "render" and self.rendering else field
+        self._due[field] = now + self.intervals[interval_key]
+        cost = self.calls[field] / self.samples[field]
+        if cost > self.budgets[field] and self.samples[field] >= 5 and field not in self.over_budget:
+            self.over_budget.add(field)
+            print(f"Sampling {field} costs {cost:.1f} Resolve calls, over its budget of {self.budgets[field]:g}.")
+
+    def sample(self, resolve, project, timeline, timeline_id=None):
+        """
+        Blocking. Returns the details for the current project and timeline handles, sampling what is due.
+        timeline_id: the timeline's unique id (ResolveObjectCache.timeline_id) to tell timelines apart by;
+        without it, the handles are compared.
+        """
+        if project is None:
+            self.reset()
+            return {}
+        if timeline_id is None:
+            timeline_id = timeline
+        if timeline_id != self._timeline_id:
+            # Everything about the previous timeline is stale
+            self._timeline_id = timeline_id
+            self._due.pop("timeline", None)
+            self._due.pop("timecode", None)
+            self.details.pop("duration", None)
+            self.details.pop("timecode", None)
+        self._sample("page", lambda call: {"page": call(resolve.GetCurrentPage)})
+        self._sample("render", lambda call: {"render": self._render_progress(call, project)})
+        if timeline is not None:
+            self._sample("timeline", lambda call: {"duration": self._duration(call, timeline)})
+            self._sample("timecode", lambda call: {"timecode": call(timeline.GetCurrentTimecode)})
+        return dict(self.details)
+
+    def _render_progress(self, call, project):
+        """Percent done of the render in progress, None if nothing renders."""
+        if self._render_job is not None:
+            status = call(project.GetRenderJobStatus, self._render_job) or {}
+            if status.get("JobStatus") == "Rendering":
+                return status.get("CompletionPercentage", 0)
+            self._render_job = None  # Done; the queue may go on with another job
+        self.rendering = bool(call(project.IsRenderingInProgress))
+        if not self.rendering:
+            return None
+        for job in call(project.GetRenderJobList) or ():
+            status = call(project.GetRenderJobStatus, job.get("JobId")) or {}
+            if status.get("JobStatus") == "Rendering":
+                self._render_job = job.get("JobId")
+                return status.get("CompletionPercentage", 0)
+        return 0
+
+    @staticmethod
+    def _duration(call, timeline):
+        """The timeline's length in seconds, None if its frame rate is unknown."""
+        frame_rate = call(timeline.GetSetting, "timelineFrameRate")
+        frames = call(timeline.GetEndFrame) - call(timeline.GetStartFrame)
+        try:
+            frame_rate = float(str(frame_rate).split()[0])  # e.g. "23.976" or "29.97 DF"
+        except (ValueError, IndexError):
+            return None
+        return frames / frame_rate if frame_rate > 0 else None
+
+
+class ResolveHost:
+    """
+    One Resolve workstation and its pooled scripting connection: the scriptapp() handle is kept and reused
+    by every poll, each poll doubling as its health check, and dropped for a reconnect (with backoff) once
+    a poll fails. Each host has its own call thread and deadlines, so a slow or offline host only ever
+    delays its own polls.
+    address: the machine to connect to; None for this one, whose Resolve process is watched.
+    """
+    def __init__(self, address=None, executor=None, clock=time.monotonic):
+        self.address = address
+        self.name = address or "local"
+        self.executor = executor or ResolveCallExecutor()
+        self.link = Link(f"Resolve ({address})" if address else "Resolve")
+        self.poller = AdaptivePoller(clock=clock)  # Cadence of this host's project polls
+        self.resolve = None
+        self.cache = None  # ResolveObjectCache for self.resolve
+        self.sampler = ResolveDetailSampler(clock=clock)  # Extra presence details through self.cache
+        self.start_time = int(time.time())  # When the connection was made
+        self.project_state = None  # (project_name, timeline_name) of the open project, None if there is none
+        self.details = {}  # ResolveDetailSampler details of the open project
+        self.last_active = None  # clock() time the host last opened a project or switched timeline
+        self.wakeup = None  # asyncio event that cuts the host's sleeps short, created by the supervisor
+        self._clock = clock
+
+    def connect(self, script=None):
+        """Makes one connection attempt; blocking. Returns True once connected."""
+        self.drop()
+        self.resolve = get_resolve_connection(executor=self.executor, script=script, host=self.address)
+        if self.resolve:
+            self.start_time = int(time.time())
+            self.poller.kick()
+            return True
+        return False
+
+    def drop(self):
+        """Forgets the connection, and every handle reached through it."""
+        self.resolve = None  # Explicitly drop the stale object
+        self.sampler.reset()
+        if self.cache is not None:
+            self.cache.invalidate()
+            self.cache = None
+
+    def poll(self):
+        """
+        Fetches (project, project_name, timeline_name, details) through the connection, in one call with
+        one deadline; blocking. Raises ResolveBusyError if Resolve misses the deadline, ConnectionError if
+        the connection is bad.
+        """
+        if self.cache is None or self.cache.resolve is not self.resolve:
+            self.cache = ResolveObjectCache(self.resolve)  # New connection, nothing to reuse
+            self.sampler.reset()
+        return self.executor.call(self.project_info)
+
+    def project_info(self):
+        """poll() without the deadline; runs on the call thread."""
+        project, project_name, timeline_name = get_project_info(self.resolve, self.cache)
+        try:
+            details = self.sampler.sample(self.resolve, project, self.cache.timeline, self.cache.timeline_id)
+        except Exception as e:
+            self.sampler.reset()
+            raise ConnectionError(f"Resolve API call failed while sampling details: {type(e).__name__} - {e}") from e
+        return project, project_name, timeline_name, details
+
+    def set_project_state(self, project_state, details=None):
+        """Returns True if the project state changed."""
+        self.details = (details or {}) if project_state is not None else {}
+        if project_state == self.project_state:
+            return False
+        self.project_state = project_state
+        if project_state is not None:
+            self.last_active = self._clock()
+        return True
+
+
+def split_by_day(start, end):
+    """Yields (local date as "YYYY-MM-DD", seconds) for each day the span between two timestamps touches."""
+    while start < end:
+        day = datetime.date.fromtimestamp(start)
+        next_midnight = datetime.datetime.combine(day + datetime.timedelta(days=1), datetime.time()).timestamp()
+        yield day.isoformat(), min(end, next_midnight) - start
+        start = next_midnight
+
+
+class EditingTimeFold:
+    """
+    Folds editing events into seconds per day and project. Its state is what compaction keeps of the log.
+    Events are JSON arrays: ["start", t, project, timeline], ["stop", t], ["idle", t] (a stop at the last
+    observation t, with nothing observed since) and ["seen", t] (still editing at t).
+    """
+    def __init__(self, state=None):
+        state = state or {}
+        self.days = state.get("days", {})  # "YYYY-MM-DD" -> {project: seconds}
+        self.open = state.get("open")  # [project, timeline, start] of the session in progress
+        self.last_t = state.get("last_t")  # Time of the last event
+        self.run_start = state.get("run_start")  # Start of the current editing run, across short gaps
+
+    def state(self):
+        return {"days": self.days, "open": self.open, "last_t": self.last_t, "run_start": self.run_start}
+
+    def close(self, t):
+        """Ends the session in progress at t, adding its time to the totals."""
+        if self.open is not None:
+            project, _, start = self.open
+            for day, seconds in split_by_day(start, t):
+                per_project = self.days.setdefault(day, {})
+                per_project[project] = round(per_project.get(project, 0) + seconds, 1)
+            self.open = None
+
+    def apply(self, event):
+        kind, t = event[0], event[1]
+        if kind == "start":
+            if self.open is None and (self.last_t is None or t - self.last_t > TIME_LOG_IDLE_GAP):
+                self.run_start = t
+            self.close(t)
+            self.open = [event[2], event[3], t]
+        elif kind in ("stop", "idle"):
+            self.close(t)
+        self.last_t = t
+
+
+class EditingTimeLog:
+    """
+    Records editing sessions (project, timeline, start/stop and idle gaps) in an append-only log of JSON lines,
+    events.log, and compacts it into per-day, per-project totals in aggregates.json.
+    observe() runs on every poll and only queues events in memory. The disk I/O is in load(), flush() (one
+    batched write, fsynced at most every fsync_interval), compact() and close(), meant for a worker thread.
+    """
+    def __init__(self, directory=TIME_LOG_DIR, fsync_interval=TIME_LOG_FSYNC_INTERVAL, clock=time.time):
+        self.directory = directory
+        self.log_path = os.path.join(directory, "events.log")
+        self.aggregates_path = os.path.join(directory, "aggregates.json")
+        self.fsync_interval = fsync_interval
+        self.clock = clock
+        self._fold = EditingTimeFold()  # Live state, for the run start
+        self._pending = []
+        self._pending_lock = threading.Lock()
+        self._io_lock = threading.Lock()  # One writer of the log and the aggregates at a time
+        self._last_fsync = None
+        self._session = None  # (project_name, timeline_name) being edited, None if none
+        self._last_seen = None
+        self._written_t = None  # Time of the last event written to the log
+
+    @property
+    def run_start(self):
+        """When the current editing run started, resumed across reconnects and restarts; None if not editing."""
+        return self._fold.run_start if self._session is not None else None
+
+    def _record(self, event):
+        self._fold.apply(event)
+        with self._pending_lock:
+            self._pending.append(event)
+
+    def observe(self, project_state):
+        """Notes the project state of a poll: (project_name, timeline_name), or None without a project."""
+        now = round(self.clock(), 1)
+        if self._session is not None and now - self._last_seen > TIME_LOG_IDLE_GAP:
+            self._record(["idle", self._last_seen])  # Nothing observed for a while (sleep, Resolve hung)
+            self._session = None
+        if project_state != self._session:
+            if project_state is None:
+                self._record(["stop", now])
+            else:
+                self._record(["start", now, project_state[0], project_state[1] or None])
+            self._session = project_state
+        self._last_seen = now
+
+    def load(self):
+        """Compacts what earlier runs logged and resumes from it."""
+        self._fold = self.compact()
+        if self._fold.open is not None:  # The last run never stopped its session (crash, power loss)
+            self._record(["idle", self._fold.last_t])
+        self._last_seen = self._fold.last_t
+
+    def flush(self, sync=False):
+        """Appends the queued events to the log."""
+        with self._pending_lock:
+            events, self._pending = self._pending, []
+            last_seen = self._last_seen
+            if self._session is not None and last_seen != self._written_t and \
+                    (not events or events[-1][1] != last_seen):
+                events.append(["seen", last_seen])  # So a crash loses at most one flush interval
+        if not events and not sync:
+            return
+        with self._io_lock:
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                with open(self.log_path, "a") as f:
+                    f.write("".join(json.dumps(event, separators=(",", ":")) + "\n" for event in events))
+                    f.flush()
+                    now = time.monotonic()
+                    if sync or self._last_fsync is None or now - self._last_fsync >= self.fsync_interval:
+                        os.fsync(f.fileno())
+                        self._last_fsync = now
+            except OSError:
+                with self._pending_lock:
+                    self._pending[:0] = events  # Try again with the next flush
+                raise
+            if events:
+                self._written_t = events[-1][1]
+
+    def _read(self):
+        """The aggregates with the events logged since they were written folded in, their offset and the log's size."""
+        try:
+            with open(self.aggregates_path) as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            state = {}
+        fold = EditingTimeFold(state)
+        offset = state.get("offset", 0)
+        try:
+            with open(self.log_path, "rb") as f:
+                size = f.seek(0, os.SEEK_END)
+                f.seek(offset if offset <= size else 0)  # Past the end: the log was emptied, not yet recorded
+                for line in f:
+                    try:
+                        fold.apply(json.loads(line))
+                    except (ValueError, IndexError):
+                        continue  # Line torn by a crash
+        except FileNotFoundError:
+            size = 0
+        return fold, offset, size
+
+    def _write_aggregates(self, fold, offset):
+        tmp_path = f"{self.aggregates_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(dict(fold.state(), offset=offset), f, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.aggregates_path)
+
+    def compact(self):
+        """Folds the log into the aggregates and empties it. Returns the folded state."""
+        self.flush(sync=True)
+        with self._io_lock:
+            fold, offset, size = self._read()
+            if size:
+                # Record how far the aggregates got before emptying the log, so a crash in between can't count twice
+                self._write_aggregates(fold, size)
+                os.truncate(self.log_path, 0)
+            if size or offset:
+                self._write_aggregates(fold, 0)
+        return fold
+
+    def close(self):
+        """Stops the session in progress and compacts."""
+        if self._session is not None:
+            self._record(["stop", round(self.clock(), 1)])
+            self._session = None
+        self.compact()
+
+    def totals(self, since=None):
+        """Seconds edited per project on and after the date since ("YYYY-MM-DD"; None for all time)."""
+        with self._io_lock:
+            fold, _, _ = self._read()  # Only the events since the last compaction are read, not the history
+        if fold.open is not None:
+            fold.close(fold.last_t)  # Count the session in progress up to its last observation
+        totals = collections.Counter()
+        for day, per_project in fold.days.items():
+            if since is None or day >= since:
+                totals.update(per_project)
+        return totals
+
+
+def editing_time_report(time_log, period):
+    """Hours per project for period ("today", "week", "month" or "all"), as printable lines."""
+    today = datetime.date.today()
+    since = {"today": today, "week": today - datetime.timedelta(days=today.weekday()),
+             "month": today.replace(day=1), "all": None}[period]
+    totals = time_log.totals(since.isoformat() if since else None)
+    title = {"today": "today", "week": "this week", "month": "this month", "all": "in total"}[period]
+    lines = [f"Editing time {title}: {sum(totals.values()) / 3600:.1f} h"]
+    width = max((len(project) for project in totals), default=0)
+    for project, seconds in totals.most_common():
+        lines.append(f"  {project:<{width}}  {seconds / 3600:6.1f} h")
+    return lines
+
+
+class StdoutStatusSink:
+    """Prints status changes; the log of the headless monitor."""
     def __init__(self):
-        super(ResolveApp, self).__init__("DRPC", quit_button=None)  # Short name for menu bar
-        self.icon = "topicon.png"  # Set the menu bar icon
-        
-        self.short_status_menu_item = rumps.MenuItem("DRPC...") # For the icon-like status
-        self.detailed_status_menu_item = rumps.MenuItem("Status: Initializing...") # For detailed messages
-        
-        self.menu = [
-            self.short_status_menu_item,
-            self.detailed_status_menu_item,
-            None,  # Separator
-            rumps.MenuItem("Reconnect to Discord", callback=self.reconnect_discord_manually),
-            rumps.MenuItem("Reconnect to Resolve", callback=self.reconnect_resolve_manually),
-            None,
-            rumps.MenuItem("Quit ResolveRPC", callback=self.quit_app_action)
-        ]
+        self._last = None
+
+    def update_status(self, monitor, message):
+        line = f"[{monitor.short_status()}] {message}"
+        if line != self._last:
+            self._last = line
+            print(line, flush=True)
+
+
+class JsonStatusFileSink:
+    """Keeps the current status in a JSON file for other tools, replacing it atomically on change."""
+    def __init__(self, path):
+        self.path = path
+        self._last = None
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    def update_status(self, monitor, message):
+        status = monitor.status()
+        if status == self._last:
+            return
+        self._last = status
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(dict(status, updated=int(time.time())), f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Could not write status file {self.path}: {e}")
+
+
+class SingleInstance:
+    """
+    Makes this process the one monitor behind a control socket: holds an exclusive lock on the socket
+    path + ".lock" (released by the OS however the process ends, so it can't go stale) and listens on the
+    socket, through which later launches send their commands (see send_control_command()).
+    """
+    def __init__(self, path=CONTROL_SOCKET_PATH):
+        self.path = path
+        self.lock_path = f"{path}.lock"
+        self.socket = None  # Listening socket, once acquired
+        self._lock_file = None
+
+    def acquire(self):
+        """Returns True if this process is now the instance, False if another one holds the lock."""
+        lock_file = open(self.lock_path, "a")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock_file.close()
+            return False
+        self._lock_file = lock_file
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(self.path)  # Left behind by an instance that didn't exit cleanly
+        self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.socket.bind(self.path)
+        os.chmod(self.path, 0o600)
+        self.socket.listen()
+        return True
+
+    def release(self):
+        if self.socket is not None:
+            self.socket.close()
+            self.socket = None
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(self.path)
+        if self._lock_file is not None:
+            self._lock_file.close()  # Unlocks, after the socket is gone
+            self._lock_file = None
+
+
+def send_control_command(command, path=CONTROL_SOCKET_PATH, timeout=CONTROL_TIMEOUT):
+    """
+    Sends one of CONTROL_COMMANDS to the running instance and returns its reply (a dict).
+    Raises OSError (or ValueError on a garbled reply) if no instance answers within timeout seconds.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.settimeout(max(0.1, deadline - time.monotonic()))
+                sock.connect(path)
+                sock.sendall(f"{command}\n".encode())
+                with sock.makefile("rb") as f:
+                    return json.loads(f.readline())
+        except (FileNotFoundError, ConnectionRefusedError):
+            # An instance that just took the lock may not be listening yet
+            if time.monotonic() >= deadline:
+                raise
+            time.sleep(0.05)
+
+
+class ResolveMonitor:
+    """
+    The Resolve/Discord presence monitor, independent of any UI.
+    Status messages go to status_sinks: objects with an update_status(monitor, message) method
+    (StdoutStatusSink, JsonStatusFileSink, the menu bar app, ...), called on the supervisor loop.
+    metrics_port: if set, metrics are served in Prometheus text format on http://127.0.0.1:<port>/metrics.
+    memory_tracker: if set, a MemoryTracker that checks retained memory for leaks every MEMORY_CHECK_INTERVAL.
+    control_socket: if set, a listening Unix socket (SingleInstance.socket) to take CONTROL_COMMANDS on;
+    "quit" calls on_quit (default: stop()).
+    time_log: if set, an EditingTimeLog that records the editing sessions; the presence's elapsed time then
+    resumes from it across reconnects and restarts.
+    Use run() to monitor on the calling thread, or start()/stop() to monitor on a background thread.
+
+    The backends can be swapped, e.g. to drive the monitor in a simulation with fake processes,
+    a fake Resolve, a fake Discord and a virtual clock (awaiting supervise() on an event loop with virtual time):
+    resolve_hosts: addresses of the Resolve workstations to monitor, None meaning this machine (the default).
+    They are polled concurrently; the presence shows the one most recently active.
+    watcher: ProcessWatcher (default: process_watcher);
+    executor: ResolveCallExecutor for this machine's Resolve (default: resolve_executor);
+    resolve_script: module providing scriptapp() (default: DaVinciResolveScript);
+    discord_client: factory(client_id, on_closed=...) for the Discord client (default: DiscordIPC);
+    clock: monotonic clock for the poll cadence and the presence rate limit.
+    """
+    def __init__(self, status_sinks=(), metrics_port=None, watcher=None, executor=None, resolve_script=None,
+                 discord_client=None, clock=time.monotonic, memory_tracker=None, time_log=None,
+                 resolve_hosts=(None,), control_socket=None):
+        self.status_sinks = list(status_sinks)
+        self.last_status = None  # The last status message
+        self.control_socket = control_socket
+        self.on_quit = None  # Called for the "quit" control command instead of stop(), e.g. to quit the app too
+        self.time_log = time_log  # EditingTimeLog recording the editing sessions, if any
+        self.memory_tracker = memory_tracker  # MemoryTracker checked every MEMORY_CHECK_INTERVAL, if any
+        self.process_watcher = watcher or process_watcher
+        self.resolve_executor = executor or resolve_executor
+        self.resolve_script = resolve_script
+        self.discord_client = discord_client or DiscordIPC
+        self.metrics = Metrics()
+        self.metrics_port = metrics_port
+        self._own_process = None
         self.rpc = None
-        self.resolve = None
+        self.presence = PresenceScheduler(clock=clock)  # All presence updates/clears go through this
+        self.resolve_hosts = [ResolveHost(address, executor=self.resolve_executor if address is None else None,
+                                          clock=clock) for address in resolve_hosts]
+        self.active_host = self.resolve_hosts[0]  # The host whose project the presence shows
+        self._host_pool = None  # A worker thread per host for its blocking calls, created by the supervisor
         self.discord_client_id = DISCORD_CLIENT_ID
-        
-        self._app_running_flag = threading.Event() # Used to signal background thread to stop
+
+        self._app_running_flag = threading.Event() # Used to signal the supervisor to stop
         self._app_running_flag.set() # Set the flag to True initially
 
-        self.start_time = int(time.time())
-        self.resolve_connected = False
-        self.discord_connected = False
+        self.discord_link = Link("Discord")
+        self.first_tick_after = None  # Seconds from this module's import to the first supervisor tick
 
-        self.main_thread = threading.Thread(target=self._main_loop_thread, daemon=True)
-        self.main_thread.start()
+        # Supervisor event loop and its events, created by supervise()
+        self._loop = None
+        self.timers = None  # TimerScheduler of the supervisor loop
+        self._stopped = None
+        self._discord_wakeup = None
+        self._presence_dirty = None
+        self._launch_observer = None  # NSWorkspace observer, while watch_app_launches() is on
+        self.main_thread = None
 
-    def update_menu_status(self, message):
-        # Update the detailed status message
-        self.detailed_status_menu_item.title = f"Status: {message}"
+    @property
+    def resolve_link(self):
+        return self.active_host.link
 
-        # Determine and update the short status for the menu
-        short_status = "DRPC..." # Default short status
+    @property
+    def poller(self):
+        return self.active_host.poller
 
+    @property
+    def project_state(self):
+        """(project_name, timeline_name) of the active host's open project, None if there is none."""
+        return self.active_host.project_state
+
+    @property
+    def resolve_connected(self):
+        return self.resolve_link.state is LinkState.CONNECTED
+
+    @property
+    def discord_connected(self):
+        return self.discord_link.state is LinkState.CONNECTED
+
+    def update_status(self, message):
+        """
+        Publishes a status message to the sinks; safe from any thread. While the supervisor runs, the sinks
+        are only ever called on its loop, one message at a time.
+        """
+        loop = self._loop
+        if loop is not None and loop.is_running():
+            try:
+                on_loop = asyncio.get_running_loop() is loop
+            except RuntimeError:
+                on_loop = False
+            if not on_loop:
+                try:
+                    loop.call_soon_threadsafe(self._publish_status, message)
+                    return
+                except RuntimeError:
+                    pass  # Supervisor loop already closed
+        self._publish_status(message)
+
+    def _publish_status(self, message):
+        self.last_status = message
+        for sink in self.status_sinks:
+            sink.update_status(self, message)
+
+    def status(self):
+        """The current state as a dict, from what the monitor already knows (no Resolve or process queries)."""
+        project_name, timeline_name = self.project_state or (None, None)
+        return {
+            "status": self.last_status,
+            "short_status": self.short_status(),
+            "resolve": self.resolve_link.state.value,
+            "resolve_host": self.active_host.address,
+            "discord": self.discord_link.state.value,
+            "project": project_name,
+            "timeline": timeline_name,
+            "details": self.active_host.details,
+        }
+
+    def short_status(self):
+        """The short status (as shown in the menu), from the link states and the project state."""
         if not self.resolve_connected and not self.discord_connected:
-            short_status = "DRPC (Offline)"
-        elif not self.resolve_connected:
-            short_status = "DRPC (No Resolve)"
-        elif not self.discord_connected:
-            short_status = "DRPC (No Discord)"
-        elif "No active project" in message or "(Manager)" in message or "No Project" in message:
-            short_status = "DRPC (Idle)"
-        elif "Initializing" in message or "Connecting" in message or "Waiting" in message:
-            short_status = "DRPC..."
-        elif self.resolve_connected and self.discord_connected:
-            # Check if we are actively editing or just in manager
-            if "Project:" in message and ("Timeline" in message or "Editing:" in message):
-                 short_status = "DRPC ✓ (Active)"
-            elif "Project:" in message and "(Manager)" in message:
-                 short_status = "DRPC ✓ (Project Manager)"
-            elif "No active project" in message:
-                 short_status = "DRPC ✓ (Idle)"
-            else: # General connected state
-                 short_status = "DRPC ✓"
-
-
-        self.short_status_menu_item.title = short_status
-        # self.title remains None or empty to keep only icon in menu bar
-
-    def _connect_discord(self):
-        if not self._app_running_flag.is_set(): return False
-        self.update_menu_status("Discord: Connecting...")
-        if not is_process_running("discord"):
-            self.update_menu_status("Discord: Not running. Waiting...")
-            if not _wait_for_process_blocking("discord", self.update_menu_status, self._app_running_flag):
-                return False # Interrupted
-        
-        if not self._app_running_flag.is_set(): return False
+            if LinkState.STARTING in (self.resolve_link.state, self.discord_link.state):
+                return "DRPC..."
+            return "DRPC (Offline)"
+        if not self.resolve_connected:
+            return "DRPC (No Resolve)"
+        if not self.discord_connected:
+            return "DRPC (No Discord)"
+        if self.project_state is None:
+            return "DRPC ✓ (Idle)"
+        if self.project_state[1]:  # Timeline open
+            return "DRPC ✓ (Active)"
+        return "DRPC ✓ (Project Manager)"
 
+    async def _connect_discord(self):
+        self.update_status("Discord: Connecting...")
         try:
-            if self.rpc:
-                try: self.rpc.close()
-                except Exception: pass
-            self.rpc = Presence(self.discord_client_id)
-            self.rpc.connect()
-            self.discord_connected = True
-            self.update_menu_status("Discord: Connected")
+            self._release_discord()
+            self.rpc = self.discord_client(self.discord_client_id, on_closed=self._discord_closed)
+            await self.rpc.connect()
+            self.presence.attach(self.rpc)
             print("Connected to Discord.")
             return True
         except Exception as e:
-            self.discord_connected = False
+            self._release_discord()
             error_msg = f"Discord: Connection failed: {str(e)[:50]}..."
-            self.update_menu_status(error_msg)
+            self.update_status(error_msg)
             print(f"Could not connect to Discord: {e}")
             return False
 
-    def _connect_resolve(self):
-        if not self._app_running_flag.is_set(): return False
-        self.update_menu_status("Resolve: Connecting...")
-        # Pass the app_running_flag to get_resolve_connection
-        self.resolve = get_resolve_connection(self.update_menu_status, self._app_running_flag)
-        if self.resolve:
-            self.resolve_connected = True
-            self.start_time = int(time.time())
-            # Status already updated by get_resolve_connection
-            return True
-        else:
-            # If get_resolve_connection returns None, it might be due to shutdown or persistent failure
-            self.resolve_connected = False
-            if self._app_running_flag.is_set(): # Only update status if not shutting down
-                 self.update_menu_status("Resolve: Connection failed.")
-            return False
+    def _discord_closed(self, rpc):
+        """Called on the supervisor loop when Discord's end of the IPC socket goes away."""
+        if rpc is self.rpc and self.discord_link.state is LinkState.CONNECTED:
+            print("Discord IPC connection lost.")
+            self._release_discord()
+            self.discord_link.fail()
+            self._discord_wakeup.set()
+
+    def _release_discord(self):
+        """Closes and drops the Discord client, so nothing of a dead connection stays referenced."""
+        self.presence.attach(None)
+        if self.rpc:
+            self.rpc.close()
+            self.rpc = None
+
+    def _close_discord(self):
+        try:
+            self.presence.clear()
+            self._release_discord()
+            print("Discord RPC cleared and closed.")
+        except Exception as e:
+            print(f"Error closing Discord RPC: {e}")
+
+    def _drop_resolve(self, host):
+        """Forgets the host's Resolve connection and the project it showed."""
+        host.drop()
+        self._set_project_state(host, None)
+
+    def _signal(self, event):
+        """Sets one of the supervisor's events from any thread."""
+        loop = self._loop
+        if loop is None or event is None:
+            return
+        try:
+            loop.call_soon_threadsafe(event.set)
+        except RuntimeError:
+            pass  # Supervisor loop already closed
 
-    def reconnect_discord_manually(self, _):
+    def app_launched(self, *names):
+        """Checks right away for a watched process that just launched under one of names (thread-safe)."""
+        names = {name.lower() for name in names}
+        for target, process_names in self.process_watcher.targets.items():
+            if names & process_names:
+                self.process_watcher.invalidate()
+                if target == "discord":
+                    self._signal(self._discord_wakeup)
+                elif target == "resolve":
+                    for host in self.resolve_hosts:
+                        if host.address is None:
+                            self._signal(host.wakeup)
+
+    def watch_app_launches(self, observe=observe_app_launches):
+        """
+        Hears of Discord and Resolve launches as they happen (macOS, needs the main thread's run loop,
+        e.g. the menu bar app's); without this, starts are found by the PROCESS_START_POLL_INTERVAL checks,
+        with it only by a PROCESS_START_POLL_INTERVAL_OBSERVED fallback check.
+        observe: observe(callback) reports launches to callback and returns an observer (None if it can't).
+        """
+        self._launch_observer = observe(self.app_launched)
+        return self._launch_observer is not None
+
+    def _process_start_poll_interval(self):
+        """Seconds between checks for a watched process that isn't running."""
+        if self._launch_observer is not None:
+            return PROCESS_START_POLL_INTERVAL_OBSERVED  # Launches wake the checks; this is for a missed one
+        return PROCESS_START_POLL_INTERVAL
+
+    def reconnect_discord(self):
+        """Makes the Discord link retry right away (thread-safe)."""
         if not self.discord_connected:
-            threading.Thread(target=self._connect_discord, daemon=True).start()
+            self.update_status("Discord: Reconnecting...")
+            self._signal(self._discord_wakeup)
         else:
-            self.update_menu_status("Discord: Already connected.")
+            self.update_status("Discord: Already connected.")
 
-
-    def reconnect_resolve_manually(self, _):
-        if not self.resolve_connected:
-            threading.Thread(target=self._connect_resolve, daemon=True).start()
+    def reconnect_resolve(self):
+        """Makes the Resolve links retry right away (thread-safe)."""
+        hosts = [host for host in self.resolve_hosts if host.link.state is not LinkState.CONNECTED]
+        if hosts:
+            self.update_status("Resolve: Reconnecting...")
+            for host in hosts:
+                self._signal(host.wakeup)
         else:
-            self.update_menu_status("Resolve: Already connected.")
+            self.update_status("Resolve: Already connected.")
+
+    def run(self):
+        """Monitors on the calling thread until stop() is called."""
+        try:
+            asyncio.run(self.supervise())
+        except Exception as e:
+            print(f"Supervisor stopped with an error: {e}")
+        print("Monitor finished.")
+
+    def start(self):
+        """Monitors on a background thread."""
+        self.main_thread = threading.Thread(target=self.run, daemon=True)
+        self.main_thread.start()
+
+    async def supervise(self):
+        """
+        Runs the Discord link, a link per Resolve host and presence publishing as independent tasks sharing
+        this object's state, so each side connects, fails and reconnects without waiting on the others.
+        """
+        self._stopped = asyncio.Event()
+        self._discord_wakeup = asyncio.Event()
+        for host in self.resolve_hosts:
+            host.wakeup = asyncio.Event()
+        # One thread per host: a host waiting out a deadline never holds up another host's poll
+        self._host_pool = concurrent.futures.ThreadPoolExecutor(len(self.resolve_hosts), "resolve-host")
+        self._presence_dirty = asyncio.Event()
+        self.timers = TimerScheduler(asyncio.get_running_loop())
+        self._loop = asyncio.get_running_loop()
+        if not self._app_running_flag.is_set():
+            return  # Quit before we even started
 
+        metrics_server = None
+        if self.metrics_port:
+            try:
+                metrics_server = await asyncio.start_server(self._serve_metrics, "127.0.0.1", self.metrics_port)
+                print(f"Serving metrics on http://127.0.0.1:{self.metrics_port}/metrics")
+            except OSError as e:
+                print(f"Could not serve metrics on port {self.metrics_port}: {e}")
+
+        control_server = None
+        if self.control_socket is not None:
+            control_server = await asyncio.start_unix_server(self._serve_control, sock=self.control_socket)
+
+        if self.memory_tracker is not None:
+            self.memory_tracker.start()
+            self.timers.call_later(MEMORY_CHECK_INTERVAL, self._check_memory)
 
-    def _main_loop_thread(self):
-        # Initial connections
-        if self._app_running_flag.is_set(): self._connect_resolve()
-        if self._app_running_flag.is_set(): self._connect_discord()
+        if self.time_log is not None:
+            try:
+                await self._run_blocking(self.time_log.load)
+            except (OSError, ValueError) as e:
+                print(f"Could not load the editing time log from {self.time_log.directory}: {e}")
+                self.time_log = None
+            else:
+                self.timers.call_later(TIME_LOG_FLUSH_INTERVAL, self._flush_time_log)
+                self.timers.call_later(TIME_LOG_COMPACT_INTERVAL, self._compact_time_log)
+
+        threading.Thread(target=self._watch_process_exits, daemon=True).start()
+        tasks = [asyncio.ensure_future(coro)
+                 for coro in (self._discord_link(), self._presence_publisher(),
+                              *(self._resolve_link(host) for host in self.resolve_hosts))]
+        await self._stopped.wait()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._host_pool.shutdown(wait=False)
+        if metrics_server is not None:
+            metrics_server.close()
+        if control_server is not None:
+            control_server.close()
+        if self.time_log is not None:
+            await self._run_blocking(self._time_log_io, self.time_log.close)
 
+        if self.rpc:
+            self._close_discord()
+            await asyncio.sleep(0)  # Let the transport flush the final clear
+
+    def _watch_process_exits(self):
+        """Blocks on process exit notifications and wakes the local link tasks when a process exits."""
         while self._app_running_flag.is_set():
+            if not self.process_watcher.wait_for_exit(None):
+                continue  # Woken for a new PID or for shutdown: nothing for the links to do
+            self._signal(self._discord_wakeup)
+            for host in self.resolve_hosts:
+                if host.address is None:
+                    self._signal(host.wakeup)
+
+    async def _run_blocking(self, fn, *args):
+        return await self._loop.run_in_executor(None, fn, *args)
+
+    async def _run_for_host(self, fn, *args):
+        return await self._loop.run_in_executor(self._host_pool, fn, *args)
+
+    def _check_memory(self):
+        if not self.memory_tracker.check():
+            self.metrics.error("memory_growth")
+        self.timers.call_later(MEMORY_CHECK_INTERVAL, self._check_memory)
+
+    def _time_log_io(self, fn):
+        """Runs one of the time log's blocking methods; on a worker thread."""
+        try:
+            fn()
+        except OSError as e:
+            self.metrics.error("time_log")
+            print(f"Could not write the editing time log: {e}")
+
+    def _flush_time_log(self):
+        self._loop.run_in_executor(None, self._time_log_io, self.time_log.flush)
+        self.timers.call_later(TIME_LOG_FLUSH_INTERVAL, self._flush_time_log)
+
+    def _compact_time_log(self):
+        self._loop.run_in_executor(None, self._time_log_io, self.time_log.compact)
+        self.timers.call_later(TIME_LOG_COMPACT_INTERVAL, self._compact_time_log)
+
+    async def _sleep(self, delay, wakeup):
+        with self.metrics.time("sleep"):
+            await self.timers.sleep(delay, wakeup)
+
+    def _resident_memory(self):
+        if self._own_process is None:
+            self._own_process = self.process_watcher.psutil.Process()
+        return self._own_process.memory_info().rss
+
+    def metrics_text(self):
+        """All metrics in Prometheus text format."""
+        lines = []
+        def metric(name, kind, help_text, samples):
+            lines.extend([f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"])
+            lines.extend(f"{name}{labels} {value}" for labels, value in samples)
+
+        links = [(f'{{link="resolve",host="{host.name}"}}', host.link) for host in self.resolve_hosts]
+        links.append(('{link="discord"}', self.discord_link))
+        metric("resolverpc_link_up", "gauge", "1 if the link is connected.",
+               [(labels, int(link.state is LinkState.CONNECTED)) for labels, link in links])
+        metric("resolverpc_connections_total", "counter", "Successful (re)connections per link.",
+               [(labels, sum(count for (_, to), count in link.transitions.items()
+                             if to is LinkState.CONNECTED)) for labels, link in links])
+        metric("resolverpc_link_failures", "gauge", "Consecutive failures per link.",
+               [(labels, link.failures) for labels, link in links])
+        metric("resolverpc_presence_updates_total", "counter", "Presence updates by outcome.",
+               [('{result="sent"}', self.presence.sent), ('{result="skipped"}', self.presence.skipped),
+                ('{result="coalesced"}', self.presence.coalesced)])
+        metric("resolverpc_resolve_hung_calls_total", "counter", "Resolve calls that missed their deadline.",
+               [(f'{{host="{host.name}"}}', host.executor.hung_calls) for host in self.resolve_hosts])
+        metric("resolverpc_process_scans_total", "counter", "Full process table scans.",
+               [("", self.process_watcher.scans)])
+        metric("resolverpc_timer_wakeups_total", "counter", "Supervisor timer wake-ups.",
+               [("", self.timers.wakeups if self.timers else 0)])
+        metric("resolverpc_detail_samples_total", "counter", "Samples of each extra presence detail.",
+               [(f'{{host="{host.name}",field="{field}"}}', count)
+                for host in self.resolve_hosts for field, count in sorted(host.sampler.samples.items())])
+        metric("resolverpc_detail_calls_total", "counter", "Resolve calls made sampling each extra presence detail.",
+               [(f'{{host="{host.name}",field="{field}"}}', count)
+                for host in self.resolve_hosts for field, count in sorted(host.sampler.calls.items())])
+        metric("resolverpc_poll_interval_seconds", "gauge", "Current Resolve poll interval.",
+               [(f'{{host="{host.name}"}}', host.poller.interval) for host in self.resolve_hosts])
+        metric("resolverpc_cpu_seconds_total", "counter", "CPU time used by the process.",
+               [("", f"{time.process_time():.3f}")])
+        metric("resolverpc_resident_memory_bytes", "gauge", "Resident memory of the process.",
+               [("", self._resident_memory())])
+        if self.memory_tracker is not None:
+            metric("resolverpc_traced_memory_growth_bytes", "gauge", "Retained memory growth since the baseline.",
+                   [("", self.memory_tracker.growth)])
+        return self.metrics.render() + "\n".join(lines) + "\n"
+
+    def metrics_summary(self):
+        """A few short lines of the key metrics, e.g. for a menu."""
+        latencies = self.active_host.executor.latency_percentiles()
+        reconnects = [sum(count for (_, to), count in link.transitions.items() if to is LinkState.CONNECTED)
+                      for link in (self.resolve_link, self.discord_link)]
+        return [
+            f"Polls: {self.poller.poll_rate():.1f}/min (every {self.poller.interval:.0f}s)"
+            + (f", {self.active_host.name} of {len(self.resolve_hosts)} hosts" if len(self.resolve_hosts) > 1 else ""),
+            f"Resolve API: p50 {latencies.get(50, 0) * 1000:.0f} ms, p99 {latencies.get(99, 0) * 1000:.0f} ms, "
+            f"{self.active_host.executor.hung_calls} hung",
+            f"Presence: {self.presence.sent} sent, {self.presence.skipped} skipped",
+            f"Connections: Resolve {reconnects[0]}, Discord {reconnects[1]}; "
+            f"errors {sum(self.metrics.errors.values())}",
+            f"Memory: {self._resident_memory() / 2**20:.0f} MB, CPU: {time.process_time():.1f} s",
+        ]
+
+    async def _serve_metrics(self, reader, writer):
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), 5)
+            while await asyncio.wait_for(reader.readline(), 5) not in (b"\r\n", b"\n", b""):
+                pass  # Skip the headers
+            parts = request_line.split()
+            if len(parts) >= 2 and parts[0] == b"GET" and parts[1].split(b"?")[0] == b"/metrics":
+                status, body = "200 OK", self.metrics_text().encode()
+            else:
+                status, body = "404 Not Found", b"Not found\n"
+            writer.write(f"HTTP/1.0 {status}\r\nContent-Type: text/plain; version=0.0.4\r\n"
+                         f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+            await writer.drain()
+        except (OSError, ValueError, asyncio.TimeoutError):
+            pass
+        finally:
+            writer.close()
+
+    async def _serve_control(self, reader, writer):
+        """Answers one control command; all from cached state, so it is instant whatever Resolve is doing."""
+        command = None
+        try:
+            command = (await asyncio.wait_for(reader.readline(), 5)).decode().strip()
+            if command == "reconnect-discord":
+                self.reconnect_discord()
+            elif command == "reconnect-resolve":
+                self.reconnect_resolve()
+            if command == "quit":
+                reply = {"ok": True}
+            elif command in CONTROL_COMMANDS:
+                reply = dict(self.status(), ok=True)
+            else:
+                reply = {"ok": False, "error": f"Unknown command {command!r}, expected one of {CONTROL_COMMANDS}."}
+            writer.write(json.dumps(reply).encode() + b"\n")
+            await writer.drain()
+        except (OSError, ValueError, asyncio.TimeoutError):
+            pass
+        finally:
+            writer.close()
+        if command == "quit":
+            print("Quit requested by another launch.")
+            (self.on_quit or self.stop)()
+
+    def _ticked(self):
+        if self.first_tick_after is None:
+            self.first_tick_after = time.perf_counter() - _IMPORT_STARTED
+            print(f"First tick {self.first_tick_after * 1000:.0f} ms after import.")
+
+    def _report_loop_error(self, link, e):
+        """Reports an unexpected error and returns the backoff delay before link tries again."""
+        self.metrics.error("loop")
+        link.fail()
+        error_msg = f"Main loop error: {type(e).__name__} - {str(e)[:100]}..." # Increased length
+        self.update_status(error_msg)
+        print(f"An error occurred in the main loop: {e}")
+        return link.backoff()
+
+    async def _discord_link(self):
+        link = self.discord_link
+        while True:
             try:
-                # 1. Check Discord Process & Connection
-                if not is_process_running("discord"):
-                    if self.discord_connected:
-                        print("Discord process not found. Clearing presence.")
-                        if self.rpc:
-                            try:
-                                self.rpc.clear()
-                            except Exception:
-                                pass
-                    self.discord_connected = False
-                    self.update_menu_status("Discord: Not running. Waiting...")
-                    if not _wait_for_process_blocking("discord", self.update_menu_status, self._app_running_flag): break
-                    if self._app_running_flag.is_set(): self._connect_discord()
+                with self.metrics.time("process_check"):
+                    running = self.process_watcher.is_running("discord")
+                self._ticked()
+                if not running:
+                    if link.state is LinkState.CONNECTED:
+                        print("Discord process not found. Its presence went with it.")
+                    self._release_discord()
+                    link.absent()
+                    self.update_status("Discord: Not running. Waiting...")
+                    await self._sleep(self._process_start_poll_interval(), self._discord_wakeup)
                     continue
-                elif not self.discord_connected:
-                    self.update_menu_status("Discord: Disconnected. Reconnecting...")
-                    if self._app_running_flag.is_set(): self._connect_discord()
-                    if not self.discord_connected: time.sleep(10); continue
-
-                # 2. Check Resolve Process & Connection
-                if not is_process_running("resolve"):
-                    if self.resolve_connected:
-                        print("Resolve process not found. Clearing presence.")
-                        if self.rpc and self.discord_connected:
-                            try:
-                                self.rpc.clear()
-                            except Exception:
-                                pass
-                    self.resolve_connected = False
-                    self.resolve = None # Explicitly set to None
-                    self.update_menu_status("Resolve: Not running. Waiting...")
-                    if not _wait_for_process_blocking("resolve", self.update_menu_status, self._app_running_flag): break
-                    if self._app_running_flag.is_set(): self._connect_resolve()
+                if link.state is LinkState.STALE:
+                    self.update_status("Discord: Disconnected. Reconnecting...")
+                    await self._sleep(link.backoff(), self._discord_wakeup)
                     continue
-                # If Resolve process is running, but we're not connected (or self.resolve is None)
-                elif not self.resolve_connected or self.resolve is None:
-                    self.update_menu_status("Resolve: Disconnected. Reconnecting...")
-                    if self._app_running_flag.is_set(): self._connect_resolve()
-                    # If still not connected after attempt, wait and retry loop
-                    if not self.resolve_connected: time.sleep(10); continue
-
-                # 3. Get Project Info
-                project, project_name, timeline_name = None, None, None
-                try:
-                    # At this point, self.resolve should be a non-None object if self.resolve_connected is True
-                    project, project_name, timeline_name = get_project_info(self.resolve)
-                except ConnectionError as e:
-                    # This catches errors from get_project_info indicating the Resolve connection is bad/stale
-                    self.update_menu_status(f"Resolve: API Error. Reconnecting.")
-                    print(f"Resolve API connection error: {e}. Marking for full reconnect.")
-                    self.resolve_connected = False # CRITICAL: Mark connection as bad
-                    self.resolve = None            # CRITICAL: Clear the stale object
-                    if self.rpc and self.discord_connected:
-                        try:
-                            self.rpc.clear()
-                        except Exception as rpc_e:
-                            print(f"Error clearing RPC: {rpc_e}")
-                    # No long sleep here, loop will continue and attempt to reconnect Resolve due to resolve_connected being False
+                if link.state is not LinkState.CONNECTED:
+                    link.starting()
+                    with self.metrics.time("discord_connect"):
+                        connected = await self._connect_discord()
+                    if not connected:
+                        self.metrics.error("discord_connect")
+                        link.fail()
+                        await self._sleep(link.backoff(), self._discord_wakeup)
+                        continue
+                    link.connected()
+                    self.update_status("Discord: Connected")
+                    self._presence_dirty.set()  # Bring the new connection up to date
+                    await self._sleep(DISCORD_CHECK_INTERVAL, self._discord_wakeup)
                     continue
+                link.healthy()  # Stayed connected for a whole check interval
+                await self._sleep(DISCORD_CHECK_INTERVAL, self._discord_wakeup)
+            except Exception as e: # General catch-all for unexpected errors
+                await self._sleep(self._report_loop_error(link, e), self._discord_wakeup)
 
-                # 4. Handle Project Info Results & Update RPC
-                # project_name being None also covers GetName() returning None if get_project_info didn't raise ConnectionError for it
-                if not project or project_name is None:
-                    if self.rpc and self.discord_connected:
-                        try:
-                            self.rpc.clear()
-                        except Exception as rpc_e:
-                            print(f"Error clearing RPC (no project/name): {rpc_e}")
-
-                    current_error_status = "Resolve: No active project."
-                    # This specific check is if get_project_info returned a project object but GetName() failed
-                    # and was handled by get_project_info returning project_name as None instead of raising error.
-                    # However, the modified get_project_info now raises ConnectionError for this.
-                    if project and project_name is None:
-                        current_error_status = "Resolve: Error reading project name."
-
-                    self.update_menu_status(current_error_status)
-                    print(f"{current_error_status} (Waiting 30s before retry if Resolve still running).")
-
-                    for _ in range(30): # Sleep for 30 seconds
-                        if not self._app_running_flag.is_set(): break
-                        time.sleep(1)
-                    if not self._app_running_flag.is_set(): break # Exit main loop if app is shutting down
-                    
-                    # After the wait, just continue. The main loop will re-evaluate everything,
-                    # including Resolve process status and connection.
+    async def _resolve_link(self, host):
+        link = host.link
+        while True:
+            try:
+                running = True  # Remote hosts: connection attempts tell
+                if host.address is None:
+                    with self.metrics.time("process_check"):
+                        running = self.process_watcher.is_running("resolve")
+                self._ticked()
+                if not running:
+                    if link.state is LinkState.CONNECTED:
+                        print("Resolve process not found. Clearing presence.")
+                    self._drop_resolve(host)
+                    link.absent()
+                    self.update_status("Resolve: Not running. Waiting...")
+                    await self._sleep(self._process_start_poll_interval(), host.wakeup)
                     continue
+                # If Resolve process is running, but we're not connected
+                if link.state is not LinkState.CONNECTED:
+                    link.starting()
+                    self.update_status(f"{link.name}: Connecting...")
+                    with self.metrics.time("resolve_connect"):
+                        connected = await self._run_for_host(host.connect, self.resolve_script)
+                    if not connected:
+                        self.metrics.error("resolve_connect")
+                        link.fail()
+                        await self._sleep(link.backoff(), host.wakeup)
+                        continue
+                    link.connected()
+                    self.update_status(f"{link.name}: Connected.")
+                poll_interval = await self._poll_resolve(host)
+                await self._sleep(poll_interval, host.wakeup)
+            except Exception as e: # General catch-all for unexpected errors
+                self._drop_resolve(host)
+                await self._sleep(self._report_loop_error(link, e), host.wakeup)
 
-                else: # Valid project and project_name
-                    if timeline_name:
-                        state = f"Editing: {timeline_name}"
-                        details = f"Project: {project_name}"
-                        menu_bar_status_detail = f"{project_name} - {timeline_name}"
-                    else:
-                        state = "Editing: No active Timeline"
-                        details = f"Project: {project_name} (Manager)"
-                        menu_bar_status_detail = f"{project_name} (Manager)"
-                    self.update_menu_status(menu_bar_status_detail)
+    async def _poll_resolve(self, host):
+        """Polls the host's current project once and returns the number of seconds until the next poll."""
+        try:
+            with self.metrics.time("get_project_info"):
+                project, project_name, timeline_name, details = await self._run_for_host(host.poll)
+        except ResolveBusyError as e:
+            self.metrics.error("resolve_busy")
+            # Resolve is alive but not answering in time: keep the last presence and try again later
+            self.update_status(f"{host.link.name}: Busy. Keeping last presence.")
+            print(f"{e} Keeping last presence.")
+            return host.poller.interval
+        except ConnectionError as e:
+            # The Resolve connection is bad/stale
+            self.metrics.error("resolve_api")
+            self.update_status(f"{host.link.name}: API Error. Reconnecting.")
+            print(f"Resolve API connection error: {e}. Marking for full reconnect.")
+            host.link.fail()
+            self._drop_resolve(host)
+            return host.link.backoff()
 
-                    try:
-                        if self.rpc and self.discord_connected:
-                            self.rpc.update(
-                                state=state, details=details, start=self.start_time,
-                                large_image="davinci", large_text="DaVinci Resolve Studio"
-                            )
-                    except Exception as e:
-                        self.discord_connected = False
-                        error_msg = f"Discord: Update failed: {str(e)[:30]}..."
-                        self.update_menu_status(error_msg)
-                        print(f"Failed to update Discord presence: {e}")
-                        # Reconnect attempt for Discord will happen at the start of the next loop.
-
-                # 5. Loop Sleep
-                for _ in range(15):
-                    if not self._app_running_flag.is_set(): break
-                    time.sleep(1)
-
-            except Exception as e: # General catch-all for unexpected errors in the loop
-                if not self._app_running_flag.is_set(): break
-                error_msg = f"Main loop error: {type(e).__name__} - {str(e)[:100]}..." # Increased length
-                self.update_menu_status(error_msg)
-                print(f"An error occurred in the main loop: {e}")
-                if self.rpc and self.discord_connected:
-                    try:
-                        self.rpc.clear()
-                    except Exception as rpc_e:
-                        print(f"Error clearing RPC on main loop error: {rpc_e}")
-                time.sleep(10)
+        # project_name being None also covers GetName() returning None if get_project_info didn't raise ConnectionError for it
+        host.link.healthy()
+        has_project = bool(project) and project_name is not None
+        poll_interval = host.poller.observe((project_name, timeline_name), idle=not has_project)
+        if host.sampler.rendering:
+            poll_interval = min(poll_interval, SAMPLE_INTERVALS["render_progress"])  # Follow the progress
+        self._set_project_state(host, (project_name, timeline_name) if has_project else None, details)
+        if host is self.active_host:  # The status follows the active host
+            if not has_project:
+                self.update_status("Resolve: No active project.")
+            elif timeline_name:
+                self.update_status(f"{project_name} - {timeline_name}")
+            else:
+                self.update_status(f"{project_name} (Manager)")
+        return poll_interval
 
-        print("Main loop thread finished.")
+    def _pick_active_host(self):
+        """
+        The host whose project the presence shows: of the hosts with a project open, the one that most
+        recently opened a project or switched timeline; failing that a connected host, else the first.
+        """
+        for hosts in ([host for host in self.resolve_hosts if host.project_state is not None],
+                      [host for host in self.resolve_hosts if host.link.state is LinkState.CONNECTED]):
+            if hosts:
+                return max(hosts, key=lambda host: host.last_active or 0)
+        return self.resolve_hosts[0]
 
+    def _set_project_state(self, host, project_state, details=None):
+        published = self.project_state, self.active_host.details
+        host.set_project_state(project_state, details)
+        self.active_host = self._pick_active_host()
+        if self.time_log is not None:
+            self.time_log.observe(self.project_state)
+        if (self.project_state, self.active_host.details) != published and self._presence_dirty is not None:
+            self._presence_dirty.set()
 
-    def quit_app_action(self, _=None): # Can be called by menu item or programmatically
-        print("Quit action initiated. Shutting down...")
-        self.update_menu_status("Shutting down...")
-        self._app_running_flag.clear()  # Signal the main loop to stop
+    def _presence_payload(self):
+        """The presence for the current project state, or None to clear it."""
+        if self.project_state is None:
+            return None
+        project_name, timeline_name = self.project_state
+        details = self.active_host.details
+        if timeline_name:
+            if details.get("render") is not None:
+                state = f"Rendering: {timeline_name} ({details['render']:.0f}%)"
+            else:
+                state = f"{PAGE_ACTIVITIES.get(details.get('page'), 'Editing')}: {timeline_name}"
+            details_text = f"Project: {project_name}"
+        else:
+            state = "Editing: No active Timeline"
+            details_text = f"Project: {project_name} (Manager)"
+        large_text = "DaVinci Resolve Studio"
+        if details.get("timecode"):
+            large_text = details["timecode"]
+            if details.get("duration"):
+                duration = int(details["duration"])
+                large_text += f" of {duration // 3600}:{duration // 60 % 60:02d}:{duration % 60:02d}"
+        run_start = self.time_log.run_start if self.time_log is not None else None
+        start = int(run_start) if run_start else self.active_host.start_time
+        return dict(state=state, details=details_text, start=start, large_image="davinci", large_text=large_text)
 
-        if self.main_thread.is_alive():
-            print("Waiting for main thread to exit...")
-            self.main_thread.join(timeout=7.0) # Increased timeout
-            if self.main_thread.is_alive():
-                print("Main thread did not exit in time.")
-        
-        if self.rpc:
+    async def _presence_publisher(self):
+        while True:
+            await self._presence_dirty.wait()
+            self._presence_dirty.clear()
+            if not (self.rpc and self.discord_connected):
+                continue  # Published once Discord (re)connects
+            payload = self._presence_payload()
             try:
-                self.rpc.clear()
-                self.rpc.close()
-                print("Discord RPC cleared and closed.")
+                # Non-blocking: the IPC client queues the frame and handles Discord's reply on its own
+                with self.metrics.time("presence_send"):
+                    if payload is None:
+                        sent = self.presence.clear()
+                    else:
+                        sent = self.presence.update(**payload)
             except Exception as e:
-                print(f"Error closing Discord RPC: {e}")
-        
-        rumps.quit_application()
+                self.metrics.error("presence_send")
+                self.discord_link.fail()
+                error_msg = f"Discord: Update failed: {str(e)[:30]}..."
+                self.update_status(error_msg)
+                print(f"Failed to update Discord presence: {e}")
+                self._discord_wakeup.set()  # Reconnect right away
+                continue
+            if sent:
+                self.discord_link.healthy()
+                latency = self.poller.presence_sent()
+                if latency is not None:
+                    print(f"Presence updated {latency:.1f}s after change "
+                          f"(polling {self.poller.poll_rate():.1f}/min).")
+            retry_after = self.presence.retry_after()
+            if retry_after is not None:
+                # Rate limited: publish the latest state once the limit allows
+                self.timers.call_later(retry_after, self._presence_dirty.set)
+
+
+    def stop(self, timeout=7.0):
+        """Stops monitoring; safe to call from any thread or a signal handler."""
+        print("Shutting down...")
+        self.update_status("Shutting down...")
+        self._app_running_flag.clear()  # Signal the supervisor to stop
+        self._signal(self._stopped)
+        self.process_watcher.wake()  # Interrupt the exit watcher
+        for host in self.resolve_hosts:
+            host.executor.shutdown()  # Don't wait on a Resolve call that may be stuck
+
+        if self.main_thread is not None and self.main_thread.is_alive() \
+                and self.main_thread is not threading.current_thread():
+            print("Waiting for monitor thread to exit...")
+            self.main_thread.join(timeout=timeout)
+            if self.main_thread.is_alive():
+                print("Monitor thread did not exit in time.")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="DaVinci Resolve Rich Presence for Discord.")
+    parser.add_argument("--headless", action="store_true",
+                        help="run without the menu bar app, e.g. under launchd; status goes to stdout")
+    parser.add_argument("--status-file", metavar="PATH", help="also keep the current status in this JSON file")
+    parser.add_argument("--metrics-port", type=int, metavar="PORT",
+                        help="serve Prometheus metrics on http://127.0.0.1:PORT/metrics")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="trace allocations and report retained memory growth by allocation site")
+    parser.add_argument("--time-log", metavar="DIR", default=TIME_LOG_DIR,
+                        help=f"keep the editing time log in DIR (default: {TIME_LOG_DIR})")
+    parser.add_argument("--no-time-log", action="store_true", help="don't record editing time")
+    parser.add_argument("--resolve-host", action="append", metavar="HOST", dest="resolve_hosts",
+                        help="monitor Resolve on HOST ('local' for this machine); repeat for several workstations")
+    parser.add_argument("--send", choices=CONTROL_COMMANDS, metavar="COMMAND",
+                        help=f"send COMMAND ({', '.join(CONTROL_COMMANDS)}) to the running instance and exit")
+    parser.add_argument("--control-socket", metavar="PATH", default=CONTROL_SOCKET_PATH,
+                        help=f"control socket of the running instance (default: {CONTROL_SOCKET_PATH})")
+    parser.add_argument("--report", choices=("today", "week", "month", "all"),
+                        help="print the hours edited per project in this period and exit")
+    args = parser.parse_args(argv)
+
+    if args.report:
+        for line in editing_time_report(EditingTimeLog(args.time_log), args.report):
+            print(line)
+        return
+
+    # One monitor per user: a later launch only forwards its command (default: status) and exits
+    instance = SingleInstance(args.control_socket)
+    if instance.acquire():
+        if args.send:
+            instance.release()
+            print("ResolveRPC is not running.")
+            sys.exit(1)
+    else:
+        try:
+            reply = send_control_command(args.send or "status", args.control_socket)
+        except (OSError, ValueError) as e:
+            print(f"No running ResolveRPC instance answered on {args.control_socket}: {e}")
+            sys.exit(1)
+        if not args.send:
+            print("ResolveRPC is already running.")
+        print(json.dumps(reply, indent=2))
+        sys.exit(0 if reply.get("ok") else 1)
 
-if __name__ == "__main__":
     print("Starting Resolve Rich Presence for macOS...")
     print("Ensure DaVinci Resolve's 'External scripting' is set to 'Local' in Preferences > System > General.")
+
+    status_sinks = []
+    if args.status_file:
+        status_sinks.append(JsonStatusFileSink(args.status_file))
+    if args.headless:
+        status_sinks.append(StdoutStatusSink())
+    monitor = ResolveMonitor(status_sinks, metrics_port=args.metrics_port,
+                             memory_tracker=MemoryTracker() if args.trace_memory else None,
+                             time_log=None if args.no_time_log else EditingTimeLog(args.time_log),
+                             resolve_hosts=[None if host == "local" else host
+                                            for host in args.resolve_hosts or ("local",)],
+                             control_socket=instance.socket)
+
+    if args.headless:
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(signum, lambda *_: monitor.stop())
+        monitor.run()
+        instance.release()
+        print("ResolveRPC has exited.")
+        return
+
     print("You might need to install 'rumps': pip3 install rumps")
-    
-    # Check if another instance is already running (simple check, not foolproof)
-    # For a more robust check, you might use a lock file or check process names more specifically.
-    app_name = "ResolveRPC" 
-    # A more specific check could be `if len([p for p in psutil.process_iter(['name', 'cmdline']) if app_name in p.info['name']]) > 1:`
-    # but this is complex due to Python interpreter names. For now, we'll skip this.
-
-    app = ResolveApp()
+    from resolve_rpc_menubar import ResolveApp  # Loads the GUI stack only for the menu bar app
+    app = ResolveApp(monitor)
     try:
         app.run()
     except Exception as e:
         print(f"Unhandled exception in rumps app: {e}")
     finally:
-        print("ResolveRPC application has exited.")
\ No newline at end of file
+        instance.release()
+        print("ResolveRPC application has exited.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+import rumps  # For macOS menu bar app
+from PyObjCTools import AppHelper  # Ships with PyObjC, which rumps runs on
+
+
+class ResolveApp(rumps.App):
+    """Menu bar UI for a ResolveMonitor; also the monitor's menu status sink."""
+    def __init__(self, monitor):
+        super(ResolveApp, self).__init__("DRPC", quit_button=None)  # Short name for menu bar
+        self.icon = "topicon.png"  # Set the menu bar icon
+
+        self.short_status_menu_item = rumps.MenuItem("DRPC...") # For the icon-like status
+        self.detailed_status_menu_item = rumps.MenuItem("Status: Initializing...") # For detailed messages
+        self.metrics_menu_items = [rumps.MenuItem("...") for _ in range(5)] # Filled from monitor.metrics_summary()
+
+        self.menu = [
+            self.short_status_menu_item,
+            self.detailed_status_menu_item,
+            ("Metrics", self.metrics_menu_items),
+            None,  # Separator
+            rumps.MenuItem("Reconnect to Discord", callback=self.reconnect_discord_manually),
+            rumps.MenuItem("Reconnect to Resolve", callback=self.reconnect_resolve_manually),
+            None,
+            rumps.MenuItem("Quit ResolveRPC", callback=self.quit_app_action)
+        ]
+
+        self.monitor = monitor
+        self.monitor.status_sinks.append(self)
+        self.monitor.on_quit = self.quit_from_monitor  # "quit" from another launch quits the app too
+        self.monitor.watch_app_launches()  # Our run loop delivers the launch notifications
+        self.monitor.start()
+
+    def update_status(self, monitor, message):
+        # Update the detailed status message
+        self.detailed_status_menu_item.title = f"Status: {message}"
+        self.short_status_menu_item.title = monitor.short_status()
+        for item, line in zip(self.metrics_menu_items, monitor.metrics_summary()):
+            item.title = line
+        # self.title remains None or empty to keep only icon in menu bar
+
+    def reconnect_discord_manually(self, _):
+        self.monitor.reconnect_discord()
+
+    def reconnect_resolve_manually(self, _):
+        self.monitor.reconnect_resolve()
+
+    def quit_from_monitor(self):
+        # Called on the monitor's thread; AppKit may only be told to terminate from the main thread
+        AppHelper.callAfter(self.quit_app_action)
+
+    def quit_app_action(self, _=None): # Can be called by menu item or programmatically
+        print("Quit action initiated.")
+        self.monitor.stop()
+        rumps.quit_application()
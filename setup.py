@@ -31,7 +31,6 @@ OPTIONS = {
     },
     'packages': [
         'rumps', 
-        'pypresence', 
         'psutil', 
         'typing_extensions'
     ],
@@ -45,5 +44,5 @@ setup(
     data_files=DATA_FILES,
     options={'py2app': OPTIONS},
     setup_requires=['py2app'],
-    py_modules=['DaVinciResolveScript'] # Add DaVinciResolveScript here
+    py_modules=['DaVinciResolveScript', 'resolve_rpc_menubar'] # Add DaVinciResolveScript here
 )
\ No newline at end of file
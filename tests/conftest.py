@@ -0,0 +1,8 @@
+import os
+import sys
+
+# The app is a set of top-level modules; make them importable from the tests and the fakes
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in (ROOT, os.path.dirname(os.path.abspath(__file__))):
+    if path not in sys.path:
+        sys.path.insert(0, path)
@@ -0,0 +1,698 @@
+"""
+Fake backends for driving the monitor without macOS, Resolve or Discord: used by the tests and the
+scripts in bench/.
+"""
+import asyncio
+import collections
+import functools
+import heapq
+import itertools
+import json
+import math
+import os
+import random
+import selectors
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import resolve_rich_presence as rrp  # noqa: E402
+
+
+class FakeProcessTable:
+    """
+    Stand-in for the psutil module over a scripted process table, for ProcessWatcher(psutil_module=...).
+    background: number of unrelated processes in the table, which every full scan has to walk.
+    """
+    class NoSuchProcess(Exception):
+        pass
+
+    class AccessDenied(Exception):
+        pass
+
+    class ZombieProcess(Exception):
+        pass
+
+    STATUS_RUNNING = "running"
+    STATUS_ZOMBIE = "zombie"
+
+    class _Entry:
+        def __init__(self, pid, name, create_time, status):
+            self.info = {"pid": pid, "name": name, "create_time": create_time, "status": status}
+
+    class _Process:
+        def __init__(self, table, pid):
+            self._table = table
+            self.pid = pid
+
+        def create_time(self):
+            try:
+                return self._table.processes[self.pid][1]
+            except KeyError:
+                raise self._table.NoSuchProcess(self.pid) from None
+
+        def status(self):
+            self.create_time()  # Raises NoSuchProcess once reaped
+            return self._table.STATUS_ZOMBIE if self.pid in self._table.zombies else self._table.STATUS_RUNNING
+
+        def memory_info(self):
+            return type("MemoryInfo", (), {"rss": 0})()
+
+    def __init__(self, background=0):
+        self.processes = {}  # pid -> (name, create_time)
+        self.zombies = set()  # PIDs of processes that exited but weren't reaped, still in the table
+        self._pids = itertools.count(100)
+        # Counters
+        self.scans = 0  # process_iter() calls
+        self.entries = 0  # Entries handed out by process_iter(), i.e. the work of the scans
+        self.lookups = 0  # Process(pid) calls
+        for i in range(background):
+            self.start(f"background-{i}")
+
+    def start(self, name):
+        pid = next(self._pids)
+        self.processes[pid] = (name, float(pid))
+        return pid
+
+    def kill(self, name):
+        """Ends every process called name."""
+        for pid, (process_name, _) in list(self.processes.items()):
+            if process_name == name:
+                del self.processes[pid]
+                self.zombies.discard(pid)
+
+    def exit_unreaped(self, name):
+        """Ends every process called name without reaping it: each stays in the table as a zombie."""
+        for pid, (process_name, _) in self.processes.items():
+            if process_name == name:
+                self.zombies.add(pid)
+
+    def Process(self, pid=None):
+        self.lookups += 1
+        if pid is None:
+            return self._Process(self, os.getpid())
+        if pid not in self.processes:
+            raise self.NoSuchProcess(pid)
+        return self._Process(self, pid)
+
+    def process_iter(self, attrs=None):
+        self.scans += 1
+        for pid, (name, create_time) in list(self.processes.items()):
+            self.entries += 1
+            yield self._Entry(pid, name, create_time,
+                              self.STATUS_ZOMBIE if pid in self.zombies else self.STATUS_RUNNING)
+
+
+class FakeResolve:
+    """
+    Stand-in for the DaVinciResolveScript module and the Resolve behind it: scriptapp() returns handles
+    to a scripted model (projects, timelines, page, renders) and counts every scripting call by name.
+    fresh_proxies: hand out a new proxy object for every returned handle, as Resolve's proxies need not
+    compare equal for the same object.
+    unique_ids: whether handles have GetUniqueId() (older Resolve versions lack it on projects).
+    latency: seconds every scripting call takes, and connect_latency the seconds scriptapp() takes, spent
+    through sleep(seconds) (e.g. VirtualTimeLoop.thread_sleep).
+    """
+    class _Handle:
+        """A proxy for one model object; every method call goes through the fake for counting."""
+        def __init__(self, fake, target, generation):
+            self._fake = fake
+            self._target = target
+            self._generation = generation
+
+        def __getattr__(self, name):
+            fake = self._fake
+            if name.startswith("_") or (name == "GetUniqueId" and not fake.unique_ids):
+                raise AttributeError(name)
+            method = getattr(self._target, name)
+
+            def call(*args):
+                return fake._call(self._generation, name, method, args)
+            call.__name__ = name
+            return call
+
+    class _Resolve:
+        def __init__(self, fake):
+            self._fake = fake
+
+        def GetProjectManager(self):
+            return self._fake._manager
+
+        def GetCurrentPage(self):
+            return self._fake.page
+
+    class _ProjectManager:
+        def __init__(self, fake):
+            self._fake = fake
+
+        def GetCurrentProject(self):
+            return self._fake.project
+
+    class _Project:
+        def __init__(self, fake, name):
+            self._fake = fake
+            self.id = f"project-{next(fake._ids)}"
+            self.name = name
+            self.timelines = {}
+            self.timeline = None
+            self.render_jobs = []  # [{"JobId", "JobStatus", "CompletionPercentage"}]
+
+        def GetUniqueId(self):
+            return self.id
+
+        def GetName(self):
+            return self.name
+
+        def GetCurrentTimeline(self):
+            return self.timeline
+
+        def IsRenderingInProgress(self):
+            return any(job["JobStatus"] == "Rendering" for job in self.render_jobs)
+
+        def GetRenderJobList(self):
+            return [{"JobId": job["JobId"]} for job in self.render_jobs]
+
+        def GetRenderJobStatus(self, job_id):
+            for job in self.render_jobs:
+                if job["JobId"] == job_id:
+                    return {key: value for key, value in job.items() if key != "JobId"}
+            return {}
+
+    class _Timeline:
+        def __init__(self, fake, name, frame_rate="24", frames=24 * 60):
+            self.id = f"timeline-{next(fake._ids)}"
+            self.name = name
+            self.frame_rate = frame_rate
+            self.frames = frames
+
+        def GetUniqueId(self):
+            return self.id
+
+        def GetName(self):
+            return self.name
+
+        def GetSetting(self, name):
+            return self.frame_rate if name == "timelineFrameRate" else ""
+
+        def GetStartFrame(self):
+            return 86400
+
+        def GetEndFrame(self):
+            return 86400 + self.frames
+
+        def GetCurrentTimecode(self):
+            return "01:00:00:00"
+
+    def __init__(self, fresh_proxies=False, unique_ids=True, latency=0.0, connect_latency=0.0, sleep=time.sleep):
+        self.fresh_proxies = fresh_proxies
+        self.unique_ids = unique_ids
+        self.latency = latency
+        self.connect_latency = connect_latency
+        self.sleep = sleep
+        self.running = True  # Whether scriptapp() connects
+        self.page = "edit"
+        self.project = None
+        self._ids = itertools.count(1)
+        self._manager = self._ProjectManager(self)
+        self._root = self._Resolve(self)
+        self._generation = 0  # Bumped by crash(): older handles go stale
+        self._proxies = {}
+        # Counters
+        self.calls = collections.Counter()  # method name -> scripting calls
+        self.connects = 0
+
+    @property
+    def total_calls(self):
+        return sum(self.calls.values())
+
+    def scriptapp(self, app, host=None):
+        self.connects += 1
+        if self.connect_latency:
+            self.sleep(self.connect_latency)
+        return self._wrap(self._root) if self.running else None
+
+    def _wrap(self, value):
+        if not isinstance(value, (self._Resolve, self._ProjectManager, self._Project, self._Timeline)):
+            return value
+        if self.fresh_proxies:
+            return self._Handle(self, value, self._generation)
+        key = (id(value), self._generation)
+        if key not in self._proxies:
+            self._proxies[key] = self._Handle(self, value, self._generation)
+        return self._proxies[key]
+
+    def _call(self, generation, name, method, args):
+        self.calls[name] += 1
+        if self.latency:
+            self.sleep(self.latency)
+        if generation != self._generation or not self.running:
+            return None  # A stale handle: Resolve's proxies return None once the connection is gone
+        return self._wrap(method(*args))
+
+    # Scripting the model
+
+    def open_project(self, name, timelines=("Timeline 1",)):
+        project = self._Project(self, name)
+        for timeline in timelines:
+            project.timelines[timeline] = self._Timeline(self, timeline)
+        project.timeline = next(iter(project.timelines.values()), None)
+        self.project = project
+        return project
+
+    def close_project(self):
+        self.project = None
+
+    def switch_timeline(self, name):
+        timelines = self.project.timelines
+        if name not in timelines:
+            timelines[name] = self._Timeline(self, name)
+        self.project.timeline = timelines[name]
+
+    def start_render(self, job_id="job-1"):
+        self.project.render_jobs.append({"JobId": job_id, "JobStatus": "Rendering", "CompletionPercentage": 0})
+
+    def render_progress(self, percent, job_id="job-1"):
+        for job in self.project.render_jobs:
+            if job["JobId"] == job_id:
+                job["CompletionPercentage"] = percent
+                if percent >= 100:
+                    job["JobStatus"] = "Complete"
+
+    def crash(self):
+        """Resolve quits: every handle goes stale and scriptapp() fails until start()."""
+        self.running = False
+        self._generation += 1
+        self._proxies.clear()
+
+    def start(self):
+        self.running = True
+
+
+class FakeResolveNetwork:
+    """Stand-in for the DaVinciResolveScript module reaching a FakeResolve per host address (None: this machine)."""
+    def __init__(self, hosts):
+        self.hosts = hosts
+
+    def scriptapp(self, app, host=None):
+        return self.hosts[host].scriptapp(app, host)
+
+
+class VirtualTimeLoop(asyncio.SelectorEventLoop):
+    """
+    Event loop on a virtual clock: whenever it would wait for a timer it jumps straight to it, so hours
+    of timers run in moments. Work in run_in_executor() still runs on real threads; the clock stands still
+    while any of it is running, and moves on once all of it is done or asleep in thread_sleep().
+    """
+    REAL_WAIT = 0.05  # Seconds to wait for executor threads before looking again
+
+    class _Selector(selectors.DefaultSelector):
+        def __init__(self, loop):
+            super().__init__()
+            self._virtual_loop = loop
+
+        def select(self, timeout=None):
+            events = super().select(0)
+            if events or timeout == 0:
+                return events
+            if self._virtual_loop._advance(timeout):
+                return []
+            # Executor threads are running: wait for one to call back, or to fall asleep
+            return super().select(self._virtual_loop.REAL_WAIT)
+
+    def __init__(self, start=0.0):
+        self._now = start
+        self._busy = 0  # run_in_executor() jobs in flight
+        self._sleepers = []  # Heap of (wake time, seq, threading.Event) of threads in thread_sleep()
+        self._sleepers_lock = threading.Lock()
+        self._seq = itertools.count()
+        super().__init__(self._Selector(self))
+
+    def time(self):
+        return self._now
+
+    def run_in_executor(self, executor, func, *args):
+        future = super().run_in_executor(executor, func, *args)
+        self._busy += 1
+        future.add_done_callback(self._job_done)
+        return future
+
+    def _job_done(self, future):
+        self._busy -= 1
+
+    def thread_sleep(self, seconds):
+        """time.sleep() on the virtual clock, for executor threads."""
+        if threading.get_ident() == self._thread_id:
+            self._now += seconds  # Blocking the loop itself: time passes with nothing else running
+            return
+        wake = threading.Event()
+        with self._sleepers_lock:
+            heapq.heappush(self._sleepers, (self._now + seconds, next(self._seq), wake))
+        self.call_soon_threadsafe(lambda: None)  # Let the loop see that this thread is asleep
+        wake.wait()
+
+    def _advance(self, timeout):
+        """Moves the clock on to the next timer or sleeper within timeout, unless a thread is running."""
+        with self._sleepers_lock:
+            if self._busy > len(self._sleepers):
+                return False
+            until = math.inf if timeout is None else self._now + timeout
+            if self._sleepers and self._sleepers[0][0] <= until:
+                self._now = max(self._now, self._sleepers[0][0])
+                while self._sleepers and self._sleepers[0][0] <= self._now:
+                    heapq.heappop(self._sleepers)[2].set()
+                return True
+            if timeout is None:
+                return False
+            self._now = until
+            return True
+
+
+class FakeDiscord:
+    """
+    Stand-in for the Discord app, for ResolveMonitor(discord_client=fake.client): clients connect after
+    connect_latency seconds of loop time and record every presence update with its clock() time.
+    """
+    class _Client:
+        def __init__(self, discord, on_closed):
+            self._discord = discord
+            self.on_closed = on_closed
+            self.connected = False
+
+        async def connect(self):
+            discord = self._discord
+            discord.connects += 1
+            if discord.connect_latency:
+                await asyncio.sleep(discord.connect_latency)
+            if not discord.running:
+                raise ConnectionError("No Discord IPC socket found.")
+            self.connected = True
+            discord.clients.append(self)
+
+        def update(self, **payload):
+            self._send(payload)
+
+        def clear(self):
+            self._send(None)
+
+        def _send(self, activity):
+            if not self.connected:
+                raise ConnectionError("Discord IPC connection is closed.")
+            self._discord.activity = activity
+            self._discord.updates.append((self._discord.clock(), activity))
+
+        def close(self):
+            self.connected = False
+            if self in self._discord.clients:
+                self._discord.clients.remove(self)
+
+    def __init__(self, clock=time.monotonic, connect_latency=0.0):
+        self.clock = clock
+        self.connect_latency = connect_latency
+        self.running = True
+        self.activity = None  # The presence shown
+        self.updates = []  # (clock() time, activity or None) of every presence write
+        self.clients = []  # Connected clients
+        self.connects = 0
+
+    def client(self, client_id, on_closed=None):
+        return self._Client(self, on_closed)
+
+    def disconnect(self):
+        """Drops every connection, as a quitting or restarting Discord does; call on the loop."""
+        self.activity = None
+        for client in list(self.clients):
+            client.close()
+            if client.on_closed:
+                client.on_closed(client)
+
+
+class FakeDiscordServer:
+    """
+    Discord's end of the IPC socket at path, serving on the running loop: answers the handshake with READY
+    (or refuses it), and every frame with a reply after reply_delay seconds (None: never replies).
+    Records the presence updates like FakeDiscord, timed by the loop's clock.
+    """
+    HEADER = rrp.DiscordIPC.HEADER
+
+    def __init__(self, path, reply_delay=0.0, refuse=False):
+        self.path = path
+        self.reply_delay = reply_delay
+        self.refuse = refuse
+        self.frames = []  # (op, payload) of every frame received
+        self.pongs = []  # Payloads of the PONG frames received
+        self.updates = []  # (loop time, activity or None) of every SET_ACTIVITY
+        self.activity = None  # The presence shown
+        self.connects = 0
+        self._writers = []
+        self._server = None
+
+    async def start(self):
+        self._server = await asyncio.start_unix_server(self._serve, self.path)
+        return self
+
+    @property
+    def running(self):
+        return self._server is not None
+
+    def _send(self, writer, op, payload):
+        if writer.is_closing():
+            return
+        data = json.dumps(payload).encode()
+        writer.write(self.HEADER.pack(op, len(data)) + data)
+
+    async def _serve(self, reader, writer):
+        loop = asyncio.get_running_loop()
+        self._writers.append(writer)
+        self.connects += 1
+        try:
+            while True:
+                op, length = self.HEADER.unpack(await reader.readexactly(self.HEADER.size))
+                payload = json.loads(await reader.readexactly(length))
+                self.frames.append((op, payload))
+                if op == rrp.DiscordIPC.OP_HANDSHAKE:
+                    if self.refuse:
+                        self._send(writer, rrp.DiscordIPC.OP_CLOSE, {"code": 4000, "message": "Invalid Client ID"})
+                    else:
+                        self._send(writer, rrp.DiscordIPC.OP_FRAME,
+                                   {"cmd": "DISPATCH", "evt": "READY", "data": {"v": 1}})
+                elif op == rrp.DiscordIPC.OP_PONG:
+                    self.pongs.append(payload)
+                elif op == rrp.DiscordIPC.OP_FRAME:
+                    if payload.get("cmd") == "SET_ACTIVITY":
+                        self.activity = payload["args"]["activity"]
+                        self.updates.append((loop.time(), self.activity))
+                    if self.reply_delay is not None:
+                        reply = {"cmd": payload.get("cmd"), "evt": None, "nonce": payload.get("nonce"),
+                                 "data": payload.get("args", {}).get("activity")}
+                        loop.call_later(self.reply_delay, self._send, writer, rrp.DiscordIPC.OP_FRAME, reply)
+        except (OSError, ValueError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._writers.remove(writer)
+            writer.close()
+            self.activity = None  # Discord drops the presence of a client that goes away
+
+    @property
+    def activities(self):
+        """The activities of the SET_ACTIVITY frames received, in order."""
+        return [payload["args"]["activity"] for op, payload in self.frames
+                if op == rrp.DiscordIPC.OP_FRAME and payload.get("cmd") == "SET_ACTIVITY"]
+
+    def ping(self, payload):
+        for writer in self._writers:
+            self._send(writer, rrp.DiscordIPC.OP_PING, payload)
+
+    def pause(self):
+        """Stops reading from every connection, as a hung Discord does; frames back up in the client."""
+        for writer in self._writers:
+            writer.transport.pause_reading()
+
+    def resume(self):
+        for writer in self._writers:
+            writer.transport.resume_reading()
+
+    def drop(self):
+        """Closes every connection, as a quitting Discord does."""
+        for writer in list(self._writers):
+            writer.close()
+
+    def close(self):
+        """Stops listening and drops every connection, as a quitting Discord does."""
+        self.drop()
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+
+class Simulation:
+    """
+    A ResolveMonitor wired to fake backends on a VirtualTimeLoop: a process table running Discord and
+    Resolve, a FakeResolve and a FakeDiscord. start(), then advance() the virtual clock and script
+    the fakes in between, then stop(). Scripts record the presence state each change should lead to with
+    expect(), for report() to measure the change-to-presence latency.
+    real_time: run on a plain event loop and the wall clock instead, latencies included.
+    launch_events: report the launches of launch_resolve() and launch_discord() to the monitor as they
+    happen, as the menu bar app's NSWorkspace observer does.
+    """
+    def __init__(self, resolve_latency=0.0, resolve_connect_latency=0.0, discord_connect_latency=0.0,
+                 discord_ipc=False, resolve_hosts=(None,), background=0, fresh_proxies=False, seed=0,
+                 real_time=False, launch_events=False, **monitor_options):
+        random.seed(seed)  # Reconnect jitter
+        self.loop = asyncio.new_event_loop() if real_time else VirtualTimeLoop()
+        sleep = time.sleep if real_time else self.loop.thread_sleep
+        self.processes = FakeProcessTable(background)
+        self.processes.start("Discord")
+        self.processes.start("Resolve")
+        # A FakeResolve per workstation; self.resolve is the first one's
+        self.resolves = {address: FakeResolve(fresh_proxies=fresh_proxies, latency=resolve_latency,
+                                              connect_latency=resolve_connect_latency, sleep=sleep)
+                         for address in resolve_hosts}
+        self.resolve = self.resolves[resolve_hosts[0]]
+        self._directory = None
+        if discord_ipc:
+            # The real DiscordIPC client against a FakeDiscordServer on the loop
+            self._directory = tempfile.mkdtemp(prefix="drpc-")
+            self.discord = FakeDiscordServer(os.path.join(self._directory, "discord-ipc-0"))
+            self.loop.run_until_complete(self.discord.start())
+            discord_client = functools.partial(rrp.DiscordIPC, paths=[self.discord.path])
+        else:
+            self.discord = FakeDiscord(clock=self.loop.time, connect_latency=discord_connect_latency)
+            discord_client = self.discord.client
+        self.watcher = rrp.ProcessWatcher(psutil_module=self.processes, min_interval=0, notifier=rrp.ExitNotifier())
+        self.monitor = rrp.ResolveMonitor(watcher=self.watcher, executor=rrp.ResolveCallExecutor(),
+                                          resolve_script=FakeResolveNetwork(self.resolves),
+                                          discord_client=discord_client, resolve_hosts=resolve_hosts,
+                                          clock=self.loop.time, **monitor_options)
+        self._launched = None  # The monitor's launch callback, with launch_events
+        if launch_events:
+            self.monitor.watch_app_launches(observe=self._observe_launches)
+        self.changes = []  # (time, presence state expected after the change, None for no presence)
+        self.started = self.loop.time()
+        self._supervisor = None
+        self._cpu = None
+
+    def _observe_launches(self, callback):
+        self._launched = callback
+        return callback
+
+    def _report_launch(self, *names):
+        """What NSWorkspace's launch notification does, with launch_events."""
+        if self._launched is not None:
+            self._launched(*names)
+
+    @property
+    def now(self):
+        return self.loop.time()
+
+    def start(self):
+        self._cpu = time.process_time()
+        self._supervisor = self.loop.create_task(self.monitor.supervise())
+        self.advance(0)
+
+    def advance(self, seconds):
+        """Runs the monitor for seconds of virtual time."""
+        self.loop.run_until_complete(asyncio.sleep(seconds))
+
+    def call(self, fn, *args):
+        """Calls fn on the loop, e.g. to script a fake that the monitor's tasks are using."""
+        async def call():
+            return fn(*args)
+        return self.loop.run_until_complete(call())
+
+    def expect(self, state):
+        """Records that the presence state should become state (None: no presence) after a change made now."""
+        self.changes.append((self.now, state))
+
+    def shown(self, state):
+        """Whether Discord shows the presence state (None: no presence)."""
+        activity = self.discord.activity
+        return (activity and activity.get("state")) == state
+
+    def latencies(self):
+        """Seconds from each expected change to Discord showing it; None where a later change came first."""
+        latencies = []
+        for i, (changed, state) in enumerate(self.changes):
+            until = self.changes[i + 1][0] if i + 1 < len(self.changes) else math.inf
+            shown = [time for time, activity in self.discord.updates
+                     if changed <= time <= until and (activity and activity.get("state")) == state]
+            latencies.append(shown[0] - changed if shown else None)
+        return latencies
+
+    def forget(self):
+        """Drops what the fakes recorded so far (presence updates, frames, expected changes)."""
+        del self.discord.updates[:]
+        del getattr(self.discord, "frames", [])[:]
+        del self.changes[:]
+
+    def reconnects(self):
+        """Reconnections per link (connections after the first)."""
+        links = [self.monitor.discord_link] + [host.link for host in self.monitor.resolve_hosts]
+        return {link.name: max(0, sum(count for (_, to), count in link.transitions.items()
+                                      if to is rrp.LinkState.CONNECTED) - 1) for link in links}
+
+    def report(self):
+        """What the run cost and how well the presence followed; call after stop()."""
+        hours = (self.now - self.started) / 3600
+        polls = self.monitor.metrics.phases["get_project_info"].count if "get_project_info" in \
+            self.monitor.metrics.phases else 0
+        latencies = [latency for latency in self.latencies() if latency is not None]
+        return {
+            "simulated_hours": hours,
+            "cpu_ms_per_hour": self._cpu * 1000 / hours if hours else 0.0,
+            "polls": polls,
+            "api_calls_per_tick": sum(resolve.total_calls for resolve in self.resolves.values()) / polls
+            if polls else 0.0,
+            "presence_writes": len(self.discord.updates),
+            "wakeups_per_hour": self.monitor.timers.wakeups / hours if hours else 0.0,
+            "latency_median": statistics.median(latencies) if latencies else None,
+            "latency_max": max(latencies) if latencies else None,
+            "changes_shown": f"{len(latencies)}/{len(self.changes)}",
+            "reconnects": self.reconnects(),
+        }
+
+    def stop(self):
+        self.monitor.stop()
+        self.loop.run_until_complete(self._supervisor)
+        self._cpu = time.process_time() - self._cpu
+        if self._directory is not None:
+            self.discord.close()
+            self.advance(0)
+            shutil.rmtree(self._directory, ignore_errors=True)
+        self.loop.close()
+
+    # Scenarios
+
+    def quit_resolve(self):
+        self.resolve.crash()
+        self.processes.kill("Resolve")
+        self.watcher.wake()  # What the OS exit notification does for a real PID
+
+    def launch_resolve(self):
+        self.processes.start("Resolve")
+        self.resolve.start()
+        self._report_launch("Resolve", "DaVinci Resolve")
+
+    def quit_discord(self):
+        self.processes.kill("Discord")
+        self.watcher.wake()
+        if isinstance(self.discord, FakeDiscordServer):
+            self.call(self.discord.close)
+        else:
+            self.discord.running = False
+            self.call(self.discord.disconnect)
+
+    def launch_discord(self):
+        self.processes.start("Discord")
+        if isinstance(self.discord, FakeDiscordServer):
+            self.loop.run_until_complete(self.discord.start())
+        else:
+            self.discord.running = True
+        self._report_launch("Discord")
+
+    def restart_discord(self):
+        """Discord drops its connections and is back at once, without its process being seen to exit."""
+        self.call(self.discord.drop if isinstance(self.discord, FakeDiscordServer) else self.discord.disconnect)
+
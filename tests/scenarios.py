@@ -0,0 +1,106 @@
+"""
+Scripted scenarios for a started Simulation, shared by tests/test_simulation.py and bench/simulate.py.
+Each one scripts the fakes over virtual time and records the presence each change should lead to.
+"""
+EDITING = "Editing: Timeline 1"
+
+
+def resolve_crash(sim):
+    """Resolve quits under an open project and is launched again a minute later."""
+    sim.resolve.open_project("Film")
+    sim.expect(EDITING)
+    sim.advance(60)
+    sim.quit_resolve()
+    sim.expect(None)
+    sim.advance(60)
+    sim.launch_resolve()
+    sim.resolve.open_project("Film")
+    sim.expect(EDITING)
+    sim.advance(60)
+
+
+def resolve_restart(sim):
+    """Resolve restarts between two polls: the process is back, every cached handle is stale."""
+    sim.resolve.open_project("Film")
+    sim.expect(EDITING)
+    sim.advance(60)
+    sim.resolve.crash()
+    sim.resolve.start()
+    sim.resolve.open_project("Film", timelines=("Timeline 2",))
+    sim.expect("Editing: Timeline 2")
+    sim.advance(60)
+
+
+def discord_restart(sim):
+    """Discord drops its connection and is back at once; later it quits and is launched again."""
+    sim.resolve.open_project("Film")
+    sim.expect(EDITING)
+    sim.advance(60)
+    sim.restart_discord()
+    sim.expect(EDITING)  # Discord forgets the presence of a dropped client: it has to be sent again
+    sim.advance(60)
+    sim.quit_discord()
+    sim.advance(60)
+    sim.launch_discord()
+    sim.expect(EDITING)
+    sim.advance(60)
+
+
+def timeline_switching(sim, switches=40, every=3.0):
+    """Switches timeline every few seconds, faster than Discord's rate limit allows presence updates."""
+    sim.resolve.open_project("Film")
+    sim.expect(EDITING)
+    sim.advance(60)
+    for i in range(switches):
+        sim.resolve.switch_timeline(f"Cut {i}")
+        sim.expect(f"Editing: Cut {i}")
+        sim.advance(every)
+    sim.advance(60)
+
+
+def long_idle(sim, hours=8):
+    """Resolve open without a project for hours, then a project is opened."""
+    sim.advance(hours * 3600)
+    sim.resolve.open_project("Film")
+    sim.expect(EDITING)
+    sim.advance(60)
+
+
+def flapping(sim, cycles=100, every=30.0):
+    """
+    Resolve and Discord go away and come back over and over, a reconnect of each per cycle: Resolve
+    alternately crashes and restarts under stale handles, Discord drops its connection (and quits outright
+    every tenth cycle). Records no expectations, and drops the fakes' records as it goes, so that a long
+    run retains only what the monitor retains.
+    """
+    sim.resolve.open_project("Film")
+    for cycle in range(cycles):
+        sim.advance(every / 3)
+        if cycle % 2:
+            sim.quit_resolve()
+        else:
+            sim.resolve.crash()  # The process stays: found out by the next poll
+        if cycle % 10 == 9:
+            sim.quit_discord()
+        else:
+            sim.restart_discord()
+        sim.advance(every / 3)
+        if cycle % 2:
+            sim.launch_resolve()
+        else:
+            sim.resolve.start()
+        if cycle % 10 == 9:
+            sim.launch_discord()
+        sim.resolve.open_project("Film", timelines=(f"Cut {cycle % 3}",))
+        sim.advance(every / 3)
+        sim.forget()
+
+
+SCENARIOS = {
+    "resolve-crash": resolve_crash,
+    "resolve-restart": resolve_restart,
+    "discord-restart": discord_restart,
+    "timeline-switching": timeline_switching,
+    "long-idle": long_idle,
+    "flapping": flapping,
+}
@@ -0,0 +1,99 @@
+import pytest
+
+import resolve_rich_presence as rrp
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def poller(clock):
+    return rrp.AdaptivePoller(clock=clock)
+
+
+def backoff_sequence(ceiling, polls):
+    """The intervals from a change on: the minimum, then growing by the factor up to ceiling."""
+    intervals = [rrp.POLL_INTERVAL_MIN]
+    while len(intervals) < polls:
+        intervals.append(min(intervals[-1] * rrp.POLL_BACKOFF_FACTOR, ceiling))
+    return intervals
+
+
+def poll(poller, clock, state, idle=False):
+    interval = poller.observe(state, idle=idle)
+    clock.now += interval
+    return interval
+
+
+@pytest.mark.parametrize("idle, ceiling", [(False, rrp.POLL_INTERVAL_MAX), (True, rrp.POLL_INTERVAL_IDLE_MAX)])
+def test_backs_off_to_its_ceiling_while_nothing_changes(poller, clock, idle, ceiling):
+    intervals = [poll(poller, clock, "Editing: Cut", idle) for _ in range(15)]
+    assert intervals == backoff_sequence(ceiling, 15)
+    assert intervals[-1] == ceiling
+
+
+def test_change_resets_to_the_fastest_cadence(poller, clock):
+    for _ in range(10):
+        poll(poller, clock, "Editing: Cut")
+    assert poller.interval == rrp.POLL_INTERVAL_MAX
+    assert poll(poller, clock, "Editing: Grade") == rrp.POLL_INTERVAL_MIN
+    assert poll(poller, clock, "Editing: Grade") == rrp.POLL_INTERVAL_MIN * rrp.POLL_BACKOFF_FACTOR
+
+
+def test_leaving_idle_drops_to_the_active_ceiling(poller, clock):
+    for _ in range(15):
+        poll(poller, clock, None, idle=True)
+    assert poller.interval == rrp.POLL_INTERVAL_IDLE_MAX
+    assert poll(poller, clock, None) == rrp.POLL_INTERVAL_MAX
+
+
+def test_kick_resets_the_cadence(poller, clock):
+    for _ in range(10):
+        poll(poller, clock, "Editing: Cut")
+    poller.kick()
+    assert poller.interval == rrp.POLL_INTERVAL_MIN
+    assert poll(poller, clock, "Editing: Cut") == rrp.POLL_INTERVAL_MIN * rrp.POLL_BACKOFF_FACTOR
+
+
+def test_latency_is_measured_from_the_last_poll_that_saw_the_old_state(poller, clock):
+    poller.observe("Editing: Cut")
+    clock.now += 10
+    poller.observe("Editing: Grade")  # Changed some time in the last 10 s
+    clock.now += 1
+    assert poller.presence_sent() == 11  # At most this long
+    assert poller.presence_sent() is None  # Nothing was waiting for this one
+    assert poller.last_latency == 11
+
+
+def test_latency_after_a_kick_starts_at_the_poll_that_saw_the_change(poller, clock):
+    poller.observe("Editing: Cut")
+    clock.now += 100
+    poller.kick()  # E.g. Resolve reconnected: the old poll says nothing about the next change
+    clock.now += 2
+    poller.observe("Editing: Grade")
+    clock.now += 1
+    assert poller.presence_sent() == 1
+
+
+def test_poll_rate_over_the_recent_polls(poller, clock):
+    assert poller.poll_rate() == 0.0
+    poller.observe("Editing: Cut")
+    assert poller.poll_rate() == 0.0  # A single poll has no rate
+    for _ in range(30):
+        clock.now += 3
+        poller.observe("Editing: Cut")
+    assert poller.poll_rate() == pytest.approx(20.0)
+    for _ in range(30):
+        clock.now += 15
+        poller.observe("Editing: Cut")
+    assert poller.poll_rate() == pytest.approx(4.0)  # Only the recent polls count
@@ -0,0 +1,114 @@
+import math
+
+import pytest
+
+import resolve_rich_presence as rrp
+from fakes import FakeResolve
+
+POLL = rrp.POLL_INTERVAL_MIN
+HOUR = 3600
+
+
+class Poller:
+    """Polls like ResolveHost.project_info(), through a cache and a sampler on an injected clock."""
+    def __init__(self, fake):
+        self.now = 0.0
+        self.fake = fake
+        self.resolve = fake.scriptapp("Resolve")
+        self.cache = rrp.ResolveObjectCache(self.resolve)
+        self.sampler = rrp.ResolveDetailSampler(clock=lambda: self.now)
+
+    def poll(self):
+        """Returns the details and the scripting calls the sampler made on top of get_project_info()."""
+        project, _, _ = rrp.get_project_info(self.resolve, self.cache)
+        before = self.fake.total_calls
+        details = self.sampler.sample(self.resolve, project, self.cache.timeline, self.cache.timeline_id)
+        self.now += POLL
+        return details, self.fake.total_calls - before
+
+    def run(self, seconds):
+        calls = [self.poll()[1] for _ in range(int(seconds / POLL))]
+        return sum(calls) / len(calls)
+
+
+def assert_within_budgets(sampler):
+    for field, samples in sampler.samples.items():
+        assert sampler.calls[field] / samples <= rrp.SAMPLE_CALL_BUDGETS[field], field
+    assert not sampler.over_budget
+
+
+@pytest.fixture
+def poller():
+    fake = FakeResolve()
+    fake.open_project("Film")
+    return Poller(fake)
+
+
+def test_steady_state(poller):
+    details, first = poller.poll()
+    assert details == {"page": "edit", "render": None, "duration": 60.0, "timecode": "01:00:00:00"}
+    assert first == 1 + 1 + 3 + 1  # Page, render check, the timeline's frame rate and length, timecode
+    per_poll = poller.run(HOUR)
+    # Every field at its own cadence: page and render check every 10-15 s, timecode every 15 s
+    expected = POLL * sum(1 / rrp.SAMPLE_INTERVALS[field] for field in ("page", "render", "timecode"))
+    assert per_poll == pytest.approx(expected, rel=0.1)
+    assert poller.sampler.samples["timeline"] == 1  # Once per timeline
+    assert_within_budgets(poller.sampler)
+
+
+def test_render_in_progress(poller):
+    poller.run(60)
+    poller.fake.start_render()
+    renders = poller.sampler.samples["render"]
+    for percent in range(0, 100, 2):
+        poller.fake.render_progress(percent)
+        details, _ = poller.poll()
+    assert poller.sampler.rendering
+    assert details["render"] == pytest.approx(98, abs=6)  # Sampled every render_progress seconds
+    sampled = poller.sampler.samples["render"] - renders
+    every = math.ceil(rrp.SAMPLE_INTERVALS["render_progress"] / POLL) * POLL  # Samples are taken by polls
+    assert sampled == pytest.approx(50 * POLL / every, abs=2)
+    # The job is looked up once, then only its status is asked for
+    assert poller.fake.calls["GetRenderJobList"] == 1
+    assert poller.fake.calls["GetRenderJobStatus"] == sampled
+    assert_within_budgets(poller.sampler)
+
+    poller.fake.render_progress(100)
+    poller.run(60)
+    assert not poller.sampler.rendering and poller.sampler.details["render"] is None
+    assert_within_budgets(poller.sampler)
+
+
+def test_timeline_switches(poller):
+    poller.run(60)
+    switches = 20
+    for i in range(switches):
+        poller.fake.switch_timeline(f"Cut {i}")
+        details, calls = poller.poll()
+        assert details["duration"] == 60.0
+        assert calls <= rrp.SAMPLE_CALL_BUDGETS["timeline"] + rrp.SAMPLE_CALL_BUDGETS["timecode"] + 2
+        poller.run(10)
+    assert poller.sampler.samples["timeline"] == 1 + switches
+    assert poller.sampler.samples["timecode"] >= 1 + switches  # Resampled for every new timeline
+    assert_within_budgets(poller.sampler)
+
+
+def test_fresh_proxies_cost_no_extra_samples():
+    fake = FakeResolve(fresh_proxies=True)
+    fake.open_project("Film")
+    poller = Poller(fake)
+    poller.run(HOUR)
+    assert poller.sampler.samples["timeline"] == 1
+    assert_within_budgets(poller.sampler)
+
+
+def test_over_budget_is_reported_once(capsys):
+    fake = FakeResolve()
+    fake.open_project("Film")
+    poller = Poller(fake)
+    poller.sampler.budgets = dict(rrp.SAMPLE_CALL_BUDGETS, timeline=1.0)
+    for i in range(10):
+        fake.switch_timeline(f"Cut {i}")
+        poller.poll()
+    assert poller.sampler.over_budget == {"timeline"}
+    assert capsys.readouterr().out.count("Sampling timeline costs 3.0 Resolve calls") == 1
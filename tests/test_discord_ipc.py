@@ -0,0 +1,126 @@
+import asyncio
+import socket
+
+import pytest
+
+import resolve_rich_presence as rrp
+from fakes import FakeDiscordServer
+
+
+async def until(condition, timeout=2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "timed out"
+        await asyncio.sleep(0.005)
+
+
+def run(test, tmp_path, **server_options):
+    """Runs test(server, client) on a fresh loop, with the client connected to a FakeDiscordServer."""
+    async def main():
+        server = await FakeDiscordServer(str(tmp_path / "discord-ipc-0"), **server_options).start()
+        closed = []
+        client = rrp.DiscordIPC("1234", on_closed=closed.append, paths=[str(tmp_path / "missing"), server.path])
+        try:
+            await test(server, client, closed)
+        finally:
+            client.close()
+            server.close()
+    asyncio.run(main())
+
+
+def test_handshake(tmp_path):
+    async def test(server, client, closed):
+        await client.connect()
+        assert client.connected
+        assert server.frames == [(rrp.DiscordIPC.OP_HANDSHAKE, {"v": 1, "client_id": "1234"})]
+    run(test, tmp_path)
+
+
+def test_refused_handshake_raises(tmp_path):
+    async def test(server, client, closed):
+        with pytest.raises(ConnectionError, match="Invalid Client ID"):
+            await client.connect()
+        assert not client.connected
+    run(test, tmp_path, refuse=True)
+
+
+def test_no_socket_raises(tmp_path):
+    async def main():
+        with pytest.raises(ConnectionError, match="No Discord IPC socket"):
+            await rrp.DiscordIPC("1234", paths=[str(tmp_path / "discord-ipc-0")]).connect()
+    asyncio.run(main())
+
+
+def test_set_activity_does_not_wait_for_the_reply(tmp_path):
+    async def test(server, client, closed):
+        await client.connect()
+        for i in range(3):
+            client.update(state=f"Editing: Cut {i}", details="Project: Film", start=1000)
+        client.clear()
+        # All four frames are out while none has been answered
+        await until(lambda: len(server.activities) == 4)
+        assert client.sent == 4 and client.acked == 0
+        assert server.activities[0] == {"state": "Editing: Cut 0", "details": "Project: Film",
+                                        "timestamps": {"start": 1000}}
+        assert server.activities[3] is None
+    run(test, tmp_path, reply_delay=None)
+
+
+def test_replies_are_matched_to_their_frames(tmp_path):
+    async def test(server, client, closed):
+        await client.connect()
+        client.update(state="Editing: Cut 1")
+        client.update(state="Editing: Cut 2")
+        await until(lambda: client.acked == 2)
+        assert client.last_ack_latency is not None and not client._unacked
+    run(test, tmp_path, reply_delay=0.01)
+
+
+def test_frames_queued_behind_a_stalled_reader_arrive_intact(tmp_path):
+    async def test(server, client, closed):
+        await client.connect()
+        sock = client._writer.transport.get_extra_info("socket")
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 4096)
+        server.pause()
+        states = [f"S{i}" for i in range(6)]
+        for state in states:
+            client.update(state=state, large_text="x" * 4096)
+        assert client._writer.transport.get_write_buffer_size() > 0  # Queued in the transport, not sent
+        server.resume()
+        await until(lambda: len(server.activities) == len(states))
+        assert [activity["state"] for activity in server.activities] == states
+        nonces = [payload["nonce"] for op, payload in server.frames if op == rrp.DiscordIPC.OP_FRAME]
+        assert len(set(nonces)) == len(states)
+        await until(lambda: client.acked == len(states))
+    run(test, tmp_path)
+
+
+def test_ping_is_answered_with_pong(tmp_path):
+    async def test(server, client, closed):
+        await client.connect()
+        server.ping({"nonce": "abc"})
+        await until(lambda: server.pongs)
+        assert server.pongs == [{"nonce": "abc"}]
+        assert client.connected
+    run(test, tmp_path)
+
+
+def test_on_closed_fires_on_eof(tmp_path):
+    async def test(server, client, closed):
+        await client.connect()
+        server.drop()
+        await until(lambda: closed)
+        assert closed == [client]
+        assert not client.connected
+        with pytest.raises(ConnectionError):
+            client.update(state="Editing: Cut 1")
+    run(test, tmp_path)
+
+
+def test_close_does_not_call_on_closed(tmp_path):
+    async def test(server, client, closed):
+        await client.connect()
+        client.close()
+        await asyncio.sleep(0.05)
+        assert closed == []
+    run(test, tmp_path)
@@ -0,0 +1,89 @@
+import random
+
+import pytest
+
+import resolve_rich_presence as rrp
+
+S = rrp.LinkState
+
+
+def make_link(rng=lambda: 0.0):
+    """A link whose jitter takes nothing off unless rng says otherwise."""
+    return rrp.Link("Resolve", base_delay=1.0, max_delay=60.0, jitter=0.5, rng=rng)
+
+
+def test_backoff_doubles_up_to_max_delay():
+    link = make_link()
+    delays = []
+    for _ in range(10):
+        link.starting()
+        link.fail()
+        delays.append(link.backoff())
+    assert delays == [1, 2, 4, 8, 16, 32, 60, 60, 60, 60]
+
+
+def test_backoff_before_any_failure_is_the_base_delay():
+    assert make_link().backoff() == 1.0
+    assert make_link(rng=lambda: 1.0).backoff() == 0.5  # Less all of the jitter
+
+
+@pytest.mark.parametrize("failures", [1, 4, 10])
+def test_jitter_takes_off_up_to_its_share_of_the_delay(failures):
+    rng = random.Random(1)
+    link = make_link(rng.random)
+    for _ in range(failures):
+        link.fail()
+    delay = min(60.0, 2.0 ** (failures - 1))
+    delays = [link.backoff() for _ in range(1000)]
+    assert all(delay * 0.5 <= d <= delay for d in delays)
+    assert min(delays) < delay * 0.55 and max(delays) > delay * 0.95  # Spread over the whole range
+
+
+def test_failures_are_only_forgotten_by_healthy_or_absent():
+    link = make_link()
+    for _ in range(3):
+        link.fail()
+    link.backoff()
+    link.starting()
+    link.connected()  # Connecting isn't proof the app works
+    assert link.failures == 3
+    link.fail()
+    assert link.failures == 4 and link.backoff() == 8
+    link.healthy()
+    assert link.failures == 0 and link.backoff() == 1
+    link.fail()
+    link.fail()
+    link.absent()  # Quit: its next launch starts over
+    assert link.failures == 0 and link.state is S.ABSENT
+
+
+def test_fail_goes_stale_from_connected_and_to_backoff_otherwise():
+    link = make_link()
+    link.starting()
+    link.fail()
+    assert link.state is S.BACKOFF
+    link.starting()
+    link.connected()
+    link.fail()
+    assert link.state is S.STALE
+    link.backoff()
+    assert link.state is S.BACKOFF
+
+
+def test_transitions_are_counted():
+    link = make_link()
+    for _ in range(3):  # A flapping app: connects, drops, backs off, reconnects
+        link.starting()
+        link.connected()
+        link.fail()
+        link.backoff()
+    link.absent()
+    link.absent()  # No change, not counted
+    assert link.transitions == {
+        (S.ABSENT, S.STARTING): 1,
+        (S.BACKOFF, S.STARTING): 2,
+        (S.STARTING, S.CONNECTED): 3,
+        (S.CONNECTED, S.STALE): 3,
+        (S.STALE, S.BACKOFF): 3,
+        (S.BACKOFF, S.ABSENT): 1,
+    }
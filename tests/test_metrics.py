@@ -0,0 +1,74 @@
+import asyncio
+import collections
+import re
+import socket
+
+import pytest
+
+from fakes import Simulation
+
+BUCKET = re.compile(r'resolverpc_phase_seconds_bucket\{phase="(\w+)",le="([^"]+)"\} (\d+)')
+COUNT = re.compile(r'resolverpc_phase_seconds_count\{phase="(\w+)"\} (\d+)')
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def sim():
+    port = free_port()
+    sim = Simulation(metrics_port=port)
+    sim.port = port
+    sim.resolve.open_project("Film")
+    sim.start()
+    sim.advance(120)
+    yield sim
+    sim.stop()
+
+
+def request(sim, request_line):
+    """Sends one HTTP request to the monitor's metrics server; returns (status code, headers, body)."""
+    async def send():
+        reader, writer = await asyncio.open_connection("127.0.0.1", sim.port)
+        writer.write(f"{request_line}\r\nHost: localhost\r\n\r\n".encode())
+        response = await reader.read()
+        writer.close()
+        return response
+    head, _, body = sim.loop.run_until_complete(send()).decode().partition("\r\n\r\n")
+    status_line, *header_lines = head.split("\r\n")
+    headers = dict(line.split(": ", 1) for line in header_lines)
+    assert int(headers["Content-Length"]) == len(body.encode())
+    return int(status_line.split()[1]), headers, body
+
+
+def test_metrics_are_served_with_cumulative_histograms(sim):
+    status, headers, body = request(sim, "GET /metrics HTTP/1.1")
+    assert status == 200
+    assert headers["Content-Type"].startswith("text/plain")
+
+    buckets = collections.defaultdict(list)  # phase -> [(le, cumulative count)]
+    for phase, le, count in BUCKET.findall(body):
+        buckets[phase].append((float(le), int(count)))
+    counts = {phase: int(count) for phase, count in COUNT.findall(body)}
+    assert {"process_check", "get_project_info"} <= set(buckets)
+    for phase, series in buckets.items():
+        bounds = [le for le, _ in series]
+        assert bounds == sorted(bounds) and bounds[-1] == float("inf"), phase
+        cumulative = [count for _, count in series]
+        assert cumulative == sorted(cumulative), phase  # Never decreasing
+        assert cumulative[-1] == counts[phase] > 0  # +Inf holds every observation
+    assert 'resolverpc_link_up{link="discord"} 1' in body
+    assert 'resolverpc_link_up{link="resolve",host="local"} 1' in body
+
+    status, _, query_body = request(sim, "GET /metrics?format=text HTTP/1.1")
+    assert status == 200 and "resolverpc_phase_seconds_bucket" in query_body
+
+
+@pytest.mark.parametrize("request_line", ["GET / HTTP/1.1", "GET /metricsx HTTP/1.1", "POST /metrics HTTP/1.1",
+                                          "garbage"])
+def test_anything_else_is_not_found(sim, request_line):
+    status, _, body = request(sim, request_line)
+    assert status == 404 and body == "Not found\n"
@@ -0,0 +1,78 @@
+import asyncio
+import json
+import threading
+
+import resolve_rich_presence as rrp
+from fakes import Simulation
+
+HOSTS = (None, "10.0.0.2", "10.0.0.3", "10.0.0.4")
+
+
+def make_sim(hosts=HOSTS, **options):
+    sim = Simulation(discord_ipc=True, resolve_hosts=hosts, resolve_latency=0.05, resolve_connect_latency=0.2,
+                     **options)
+    for i, address in enumerate(hosts):
+        sim.resolves[address].open_project(f"Project {i}")
+    return sim
+
+
+def test_presence_follows_the_last_active_host():
+    sim = make_sim()
+    sim.start()
+    sim.advance(30)
+    sim.resolves["10.0.0.3"].switch_timeline("Grade")
+    sim.expect("Editing: Grade")
+    sim.advance(30)
+    assert sim.monitor.active_host.address == "10.0.0.3"
+    assert sim.discord.activity["details"] == "Project: Project 2"
+    sim.resolves[None].switch_timeline("Cut")
+    sim.expect("Editing: Cut")
+    sim.advance(30)
+    assert sim.monitor.active_host.address is None
+    assert max(sim.latencies()) <= rrp.POLL_INTERVAL_MAX + 1
+    sim.stop()
+
+
+def test_slow_or_offline_host_does_not_hold_up_the_others():
+    sim = make_sim()
+    sim.resolves["10.0.0.2"].latency = 10.0  # Every call takes 10 s
+    sim.resolves["10.0.0.4"].running = False  # Not accepting scripting connections
+    sim.start()
+    sim.advance(30)
+    sim.resolves[None].switch_timeline("Cut")
+    sim.expect("Editing: Cut")
+    sim.advance(30)
+    (latency,) = sim.latencies()
+    assert latency <= rrp.POLL_INTERVAL_MAX + 1
+    states = {host.address: host.link.state for host in sim.monitor.resolve_hosts}
+    assert states[None] is states["10.0.0.3"] is rrp.LinkState.CONNECTED
+    assert states["10.0.0.4"] is not rrp.LinkState.CONNECTED
+    sim.stop()
+
+
+class ThreadRecordingSink:
+    def __init__(self):
+        self.threads = set()
+
+    def update_status(self, monitor, message):
+        self.threads.add(threading.get_ident())
+
+
+def test_status_sinks_are_only_called_on_the_loop(tmp_path):
+    hosts = (None,) + tuple(f"10.0.1.{i}" for i in range(1, 16))
+    recording = ThreadRecordingSink()
+    status_file = tmp_path / "status.json"
+    sim = make_sim(hosts, status_sinks=[recording, rrp.JsonStatusFileSink(str(status_file))])
+    loop_thread = sim.call(threading.get_ident)
+    sim.start()
+    sim.advance(60)  # 16 hosts connecting and polling at once on their pool threads
+
+    async def from_a_worker():
+        await asyncio.get_running_loop().run_in_executor(None, sim.monitor.update_status, "From a worker")
+    sim.loop.run_until_complete(from_a_worker())
+    sim.advance(0)
+    assert sim.monitor.last_status == "From a worker"
+    assert recording.threads == {loop_thread}
+    assert json.loads(status_file.read_text())["discord"] == "Connected"
+    assert not (tmp_path / "status.json.tmp").exists()
+    sim.stop()
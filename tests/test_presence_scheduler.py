@@ -0,0 +1,119 @@
+import pytest
+
+import resolve_rich_presence as rrp
+
+
+class FakePresence:
+    """Records the writes a Discord client would make."""
+    def __init__(self):
+        self.writes = []
+        self.fail = False
+
+    def update(self, **payload):
+        if self.fail:
+            raise ConnectionError("Discord went away")
+        self.writes.append(payload)
+
+    def clear(self):
+        self.writes.append(None)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def presence():
+    return FakePresence()
+
+
+@pytest.fixture
+def scheduler(clock, presence):
+    scheduler = rrp.PresenceScheduler(clock=clock)
+    scheduler.attach(presence)
+    return scheduler
+
+
+def test_unchanged_payload_is_skipped(scheduler, presence):
+    assert scheduler.update(state="a")
+    assert not scheduler.update(state="a")
+    assert scheduler.clear()
+    assert not scheduler.clear()
+    assert presence.writes == [{"state": "a"}, None]
+    assert (scheduler.sent, scheduler.skipped) == (2, 2)
+
+
+def test_token_bucket_limits_bursts(scheduler, presence, clock):
+    for i in range(rrp.PRESENCE_RATE_LIMIT):
+        assert scheduler.update(state=i)
+    assert not scheduler.update(state="over")
+    # One token comes back every PRESENCE_RATE_WINDOW / PRESENCE_RATE_LIMIT seconds
+    assert scheduler.retry_after() == pytest.approx(rrp.PRESENCE_RATE_WINDOW / rrp.PRESENCE_RATE_LIMIT)
+    clock.now += scheduler.retry_after() - 0.5
+    assert not scheduler.flush()
+    clock.now += 0.5
+    assert scheduler.flush()
+    assert presence.writes[-1] == {"state": "over"}
+    assert scheduler.retry_after() is None
+
+
+def test_waiting_payloads_coalesce_into_the_latest(scheduler, presence, clock):
+    for i in range(rrp.PRESENCE_RATE_LIMIT):
+        scheduler.update(state=i)
+    for state in ("b", "c", "d"):
+        assert not scheduler.update(state=state)
+    assert not scheduler.update(state="d")  # Same as the waiting one: neither coalesced nor skipped
+    assert scheduler.coalesced == 2
+    clock.now += 60
+    assert scheduler.flush()
+    assert not scheduler.flush()
+    assert presence.writes[rrp.PRESENCE_RATE_LIMIT:] == [{"state": "d"}]
+
+
+def test_returning_to_the_sent_state_drops_the_waiting_one(scheduler, presence, clock):
+    for i in range(rrp.PRESENCE_RATE_LIMIT):
+        scheduler.update(state=i)
+    scheduler.update(state="x")
+    assert not scheduler.update(state=rrp.PRESENCE_RATE_LIMIT - 1)  # Back to what Discord shows
+    assert scheduler.retry_after() is None
+    clock.now += 60
+    assert not scheduler.flush()
+    assert len(presence.writes) == rrp.PRESENCE_RATE_LIMIT
+
+
+def test_failed_send_is_retried(scheduler, presence):
+    presence.fail = True
+    with pytest.raises(ConnectionError):
+        scheduler.update(state="a")
+    presence.fail = False
+    assert scheduler.update(state="a")  # Discord's state is unknown, so not skipped
+
+
+def test_new_connection_starts_from_no_presence(scheduler, presence):
+    scheduler.update(state="a")
+    replacement = FakePresence()
+    scheduler.attach(replacement)
+    assert scheduler.update(state="a")
+    assert replacement.writes == [{"state": "a"}]
+
+
+def test_write_volume_over_an_hour_of_polls(scheduler, presence, clock):
+    # Polls every 2 s for an hour, the timeline changing every 5 minutes: one write per change, not per poll
+    polls = 0
+    for second in range(0, 3600, 2):
+        clock.now += 2
+        scheduler.flush()
+        scheduler.update(state="Editing", details=f"Timeline {second // 300}")
+        polls += 1
+    assert polls == 1800
+    assert len(presence.writes) == 12
+    assert scheduler.skipped == 1800 - 12
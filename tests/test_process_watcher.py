@@ -0,0 +1,139 @@
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+import resolve_rich_presence as rrp
+from fakes import FakeProcessTable
+
+
+def make_watcher(table):
+    return rrp.ProcessWatcher(psutil_module=table, min_interval=0)
+
+
+def test_known_pids_are_checked_without_scanning():
+    table = FakeProcessTable(background=200)
+    table.start("Discord")
+    table.start("Resolve")
+    watcher = make_watcher(table)
+    assert watcher.is_running("discord") and watcher.is_running("resolve")
+    scans = table.scans
+    for _ in range(100):
+        assert watcher.is_running("discord") and watcher.is_running("resolve")
+    assert table.scans == scans  # Only liveness checks of the two known PIDs
+
+
+def test_missing_target_scans_and_matches_whole_names():
+    table = FakeProcessTable()
+    table.start("Discord Helper")
+    table.start("resolved")
+    watcher = make_watcher(table)
+    assert not watcher.is_running("discord")
+    assert not watcher.is_running("resolve")
+    table.start("DaVinci Resolve")
+    assert watcher.is_running("resolve")
+
+
+def test_exit_and_pid_reuse_are_noticed():
+    table = FakeProcessTable()
+    pid = table.start("Resolve")
+    watcher = make_watcher(table)
+    assert watcher.pid("resolve") == pid
+    table.processes[pid] = ("Resolve", table.processes[pid][1] + 1)  # Same PID, another process
+    assert watcher.pid("resolve") == pid  # Found again by a scan, with the new create time
+    table.kill("Resolve")
+    assert not watcher.is_running("resolve")
+
+
+def test_unreaped_exit_counts_as_an_exit():
+    table = FakeProcessTable()
+    table.start("Resolve")
+    watcher = make_watcher(table)
+    assert watcher.is_running("resolve")
+    table.exit_unreaped("Resolve")
+    assert not watcher.is_running("resolve")  # Neither alive by its PID nor found again by a scan
+    table.kill("Resolve")
+    table.start("Resolve")
+    assert watcher.is_running("resolve")
+
+
+@pytest.mark.skipif(not hasattr(os, "pidfd_open"), reason="needs pidfd (Linux)")
+def test_unreaped_child_does_not_spin_the_exit_watcher(tmp_path):
+    psutil = pytest.importorskip("psutil")
+    sleep = tmp_path / "rrp-zombie"  # A process name nothing else on the machine has
+    sleep.symlink_to(shutil.which("sleep"))
+    child = subprocess.Popen([str(sleep), "0.2"])
+    try:
+        watcher = rrp.ProcessWatcher(targets={"child": [sleep.name]}, min_interval=0)
+        assert watcher.pid("child") == child.pid
+        assert watcher.wait_for_exit(5)  # Exits, and stays a zombie: we don't reap it
+        assert psutil.Process(child.pid).status() == psutil.STATUS_ZOMBIE
+        assert not watcher.is_running("child")
+        started = time.monotonic()
+        returns = 0
+        while time.monotonic() - started < 0.5:
+            watcher.wait_for_exit(0.1)
+            returns += 1
+        assert returns <= 6  # Waits out each timeout instead of returning at once for the zombie
+    finally:
+        child.wait()
+
+
+def test_construction_sets_up_nothing():
+    watcher = rrp.ProcessWatcher()
+    assert watcher._notifier is None and watcher._psutil is None
+    watcher.wake()  # Nothing waits yet: a no-op
+    assert watcher._notifier is None
+
+
+def wait_in_thread(watcher):
+    watcher.wait_for_exit(0)  # Consume wake-ups left by earlier scans
+    result = []
+    thread = threading.Thread(target=lambda: result.append(watcher.wait_for_exit(5)))
+    thread.start()
+    time.sleep(0.05)  # Let it block
+    return thread, result
+
+
+def test_only_a_real_exit_counts_as_an_exit():
+    table = FakeProcessTable()
+    table.start("Resolve")
+    watcher = rrp.ProcessWatcher(psutil_module=table, min_interval=0, notifier=rrp.ExitNotifier())
+    assert watcher.is_running("resolve")
+
+    # A newly found PID wakes the waiter so it watches that PID too, but nothing exited
+    thread, result = wait_in_thread(watcher)
+    table.start("Discord")
+    assert watcher.is_running("discord")
+    thread.join(1)
+    assert result == [False]
+
+    # The fake PIDs can't be waited on for real, so the exit is signalled by hand
+    thread, result = wait_in_thread(watcher)
+    table.kill("Resolve")
+    watcher.wake()
+    thread.join(1)
+    assert result == [True]
+
+
+def test_app_launch_forces_the_next_check():
+    table = FakeProcessTable()
+    watcher = rrp.ProcessWatcher(psutil_module=table, min_interval=3600)
+    monitor = rrp.ResolveMonitor(watcher=watcher)
+    assert not watcher.is_running("resolve")
+    table.start("Resolve")
+    assert not watcher.is_running("resolve")  # Within min_interval: the cached result
+    monitor.app_launched("Slack")
+    assert not watcher.is_running("resolve")
+    monitor.app_launched("Resolve", "DaVinci Resolve")
+    assert watcher.is_running("resolve")
+
+
+def test_launch_observer_needs_appkit():
+    if sys.platform != "darwin":
+        assert rrp.observe_app_launches(lambda *names: None) is None
+        assert not rrp.ResolveMonitor().watch_app_launches()
@@ -0,0 +1,88 @@
+import pytest
+
+import resolve_rich_presence as rrp
+from fakes import FakeResolve
+
+
+def connect(fake):
+    resolve = fake.scriptapp("Resolve")
+    return resolve, rrp.ResolveObjectCache(resolve)
+
+
+def poll(fake, resolve, cache, polls=1):
+    """Returns the (project_name, timeline_name) of the last of polls polls and the calls they made."""
+    before = fake.total_calls
+    for _ in range(polls):
+        _, project_name, timeline_name = rrp.get_project_info(resolve, cache)
+    return (project_name, timeline_name), fake.total_calls - before
+
+
+def test_steady_state_poll_costs_two_calls():
+    fake = FakeResolve()
+    fake.open_project("Film")
+    resolve, cache = connect(fake)
+    # Manager, then for the project and the timeline: handle, id and name
+    assert poll(fake, resolve, cache) == (("Film", "Timeline 1"), 7)
+    names, calls = poll(fake, resolve, cache, polls=8)
+    assert calls == 8 * 2
+    assert fake.calls["GetUniqueId"] == 2  # Only on the first poll: equal proxies need no id
+
+
+@pytest.mark.parametrize("fresh_proxies", [False, True])
+def test_switches_are_noticed(fresh_proxies):
+    fake = FakeResolve(fresh_proxies=fresh_proxies)
+    fake.open_project("Film", timelines=("Cut 1", "Cut 2"))
+    resolve, cache = connect(fake)
+    assert poll(fake, resolve, cache)[0] == ("Film", "Cut 1")
+    fake.switch_timeline("Cut 2")
+    assert poll(fake, resolve, cache)[0] == ("Film", "Cut 2")
+    fake.open_project("Trailer", timelines=("Cut 2",))  # Same timeline name, another project
+    assert poll(fake, resolve, cache)[0] == ("Trailer", "Cut 2")
+    fake.close_project()
+    assert poll(fake, resolve, cache)[0] == (None, None)
+
+
+def test_fresh_proxies_are_told_apart_by_unique_id():
+    # Every call returns a new proxy that doesn't compare equal to the last: the names are still cached
+    fake = FakeResolve(fresh_proxies=True)
+    fake.open_project("Film")
+    resolve, cache = connect(fake)
+    poll(fake, resolve, cache)
+    names = fake.calls["GetName"]
+    assert poll(fake, resolve, cache, polls=8) == (("Film", "Timeline 1"), 8 * 4)  # Plus a GetUniqueId() each
+    assert fake.calls["GetName"] == names
+
+
+def test_without_unique_ids_the_handles_are_compared():
+    fake = FakeResolve(fresh_proxies=True, unique_ids=False)
+    fake.open_project("Film")
+    resolve, cache = connect(fake)
+    poll(fake, resolve, cache)
+    assert poll(fake, resolve, cache, polls=3) == (("Film", "Timeline 1"), 3 * 4)  # Names re-fetched every poll
+
+
+def test_stale_connection_raises():
+    fake = FakeResolve()
+    fake.open_project("Film")
+    resolve, cache = connect(fake)
+    poll(fake, resolve, cache)
+    fake.crash()
+    with pytest.raises(ConnectionError):
+        poll(fake, resolve, cache)
+
+
+def test_sampler_keeps_timeline_details_across_fresh_proxies():
+    clock = [0.0]
+    fake = FakeResolve(fresh_proxies=True)
+    fake.open_project("Film", timelines=("Cut 1", "Cut 2"))
+    host = rrp.ResolveHost(clock=lambda: clock[0])
+    host.resolve = fake.scriptapp("Resolve")
+    host.cache = rrp.ResolveObjectCache(host.resolve)
+    for _ in range(10):
+        details = host.project_info()[3]
+        clock[0] += 2
+    assert details["duration"] == 60
+    assert host.sampler.samples["timeline"] == 1  # Not every poll's new proxy taken for a new timeline
+    fake.switch_timeline("Cut 2")
+    host.project_info()
+    assert host.sampler.samples["timeline"] == 2
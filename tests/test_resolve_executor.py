@@ -0,0 +1,100 @@
+import threading
+import time
+
+import pytest
+
+import resolve_rich_presence as rrp
+
+DEADLINE = 0.1
+
+
+@pytest.fixture
+def executor():
+    executor = rrp.ResolveCallExecutor(default_deadline=DEADLINE)
+    yield executor
+    executor.shutdown()
+
+
+@pytest.fixture
+def resolve_hangs():
+    """An Event a fake Resolve call blocks on until it is set."""
+    event = threading.Event()
+    yield event
+    event.set()
+
+
+def call_when_free(executor, fn, timeout=2.0):
+    """Calls fn as soon as the executor stops rejecting calls as busy."""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return executor.call(fn)
+        except rrp.ResolveBusyError:
+            assert time.monotonic() < deadline, "still busy"
+            time.sleep(0.005)
+
+
+def test_call_returns_the_result_or_raises(executor):
+    assert executor.call(lambda a, b: a + b, 1, 2) == 3
+
+    def fails():
+        raise ValueError("no project")
+    with pytest.raises(ValueError, match="no project"):
+        executor.call(fails)
+    assert executor.calls == 2 and executor.hung_calls == 0
+
+
+def test_missed_deadline_raises_busy(executor, resolve_hangs):
+    started = time.monotonic()
+    with pytest.raises(rrp.ResolveBusyError, match="did not return within"):
+        executor.call(resolve_hangs.wait)
+    assert DEADLINE <= time.monotonic() - started < DEADLINE + 1
+    assert executor.hung_calls == 1
+
+
+def test_calls_fail_fast_while_one_hangs_and_recover_once_it_returns(executor, resolve_hangs):
+    with pytest.raises(rrp.ResolveBusyError):
+        executor.call(resolve_hangs.wait)
+    for _ in range(3):
+        started = time.monotonic()
+        with pytest.raises(rrp.ResolveBusyError, match="still running"):
+            executor.call(lambda: "queued behind the hung call")
+        assert time.monotonic() - started < DEADLINE / 2  # Not waiting out a deadline
+    assert executor.busy_rejections == 3 and executor.hung_calls == 1
+
+    resolve_hangs.set()  # Resolve answers at last
+    assert call_when_free(executor, lambda: "answered") == "answered"
+    assert executor.call(lambda: "again") == "again"
+
+
+def test_shutdown_fails_the_call_in_flight_at_once(resolve_hangs):
+    executor = rrp.ResolveCallExecutor(default_deadline=60)
+    errors = []
+
+    def caller():
+        try:
+            executor.call(resolve_hangs.wait)
+        except rrp.ResolveBusyError as e:
+            errors.append(e)
+    thread = threading.Thread(target=caller)
+    thread.start()
+    time.sleep(0.05)  # Let the call start
+    started = time.monotonic()
+    executor.shutdown()
+    thread.join(1)
+    assert not thread.is_alive() and time.monotonic() - started < 1
+    assert [str(e) for e in errors] == ["Shutting down."]
+    with pytest.raises(rrp.ResolveBusyError, match="shut down"):
+        executor.call(lambda: None)
+
+
+@pytest.mark.parametrize("latencies, expected", [
+    ([], {}),
+    ([1.0], {50: 1.0, 90: 1.0, 99: 1.0}),
+    ([1.0, 2.0], {50: 1.0, 90: 2.0, 99: 2.0}),
+    ([float(i) for i in range(1, 11)], {50: 5.0, 90: 9.0, 99: 10.0}),
+    ([float(i) for i in range(100, 0, -1)], {50: 50.0, 90: 90.0, 99: 99.0}),
+])
+def test_latency_percentiles_are_nearest_rank(executor, latencies, expected):
+    executor._latencies.extend(latencies)
+    assert executor.latency_percentiles() == expected
@@ -0,0 +1,67 @@
+import pytest
+
+import resolve_rich_presence as rrp
+import scenarios
+from fakes import Simulation
+
+BACKOFF = rrp.RECONNECT_BASE_DELAY * (1 + rrp.RECONNECT_JITTER)  # Longest first reconnect delay
+
+
+@pytest.fixture
+def sim():
+    sim = Simulation(discord_ipc=True, resolve_latency=0.005)
+    sim.start()
+    yield sim
+    if not sim.loop.is_closed():
+        sim.stop()
+
+
+def test_resolve_crash(sim):
+    scenarios.resolve_crash(sim)
+    shown, cleared, back = sim.latencies()
+    assert cleared <= 1  # The exit notification, not the next poll
+    assert back <= rrp.PROCESS_START_POLL_INTERVAL + 1
+    assert sim.reconnects() == {"Discord": 0, "Resolve": 1}
+    assert sim.shown(scenarios.EDITING)
+
+
+def test_resolve_restart_with_stale_handles(sim):
+    scenarios.resolve_restart(sim)
+    assert sim.latencies()[-1] <= rrp.POLL_INTERVAL_MAX + BACKOFF + 1
+    assert sim.monitor.metrics.errors["resolve_api"] == 1  # One failed poll, then a fresh connection
+    assert sim.reconnects()["Resolve"] == 1
+    assert sim.shown("Editing: Timeline 2")
+
+
+def test_discord_restart(sim):
+    scenarios.discord_restart(sim)
+    shown, after_restart, after_relaunch = sim.latencies()
+    assert after_restart <= BACKOFF + 0.5  # on_closed fired at once, no health check to wait for
+    assert after_relaunch <= rrp.PROCESS_START_POLL_INTERVAL + 1
+    assert sim.reconnects() == {"Discord": 2, "Resolve": 0}
+    assert sim.shown(scenarios.EDITING)
+
+
+def test_rapid_timeline_switching(sim):
+    scenarios.timeline_switching(sim)
+    writes = [time for time, activity in sim.discord.updates]
+    for i, start in enumerate(writes):
+        # The token bucket: a full bucket, plus a token every PRESENCE_RATE_WINDOW / PRESENCE_RATE_LIMIT
+        in_window = [time for time in writes[i:] if time < start + rrp.PRESENCE_RATE_WINDOW]
+        assert len(in_window) <= 2 * rrp.PRESENCE_RATE_LIMIT
+    assert len(writes) <= rrp.PRESENCE_RATE_LIMIT * (1 + sim.now / rrp.PRESENCE_RATE_WINDOW)
+    assert len(writes) < len(sim.changes)  # Switches between two sends were coalesced
+    assert sim.latencies()[-1] <= rrp.PRESENCE_RATE_WINDOW / rrp.PRESENCE_RATE_LIMIT + rrp.POLL_INTERVAL_MIN + 1
+    assert sim.shown("Editing: Cut 39")
+
+
+def test_long_idle(sim):
+    scenarios.long_idle(sim, hours=8)
+    sim.stop()
+    report = sim.report()
+    assert report["api_calls_per_tick"] < 1.1  # GetCurrentProject() finding nothing
+    assert report["polls"] <= 8 * 3600 / rrp.POLL_INTERVAL_IDLE_MAX + 30
+    assert report["wakeups_per_hour"] <= 3600 / rrp.DISCORD_CHECK_INTERVAL + 3600 / rrp.POLL_INTERVAL_IDLE_MAX
+    (opened,) = sim.latencies()
+    assert opened <= rrp.POLL_INTERVAL_IDLE_MAX  # Seen by the next idle poll
+    assert report["reconnects"] == {"Discord": 0, "Resolve": 0}
@@ -0,0 +1,67 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import pytest
+
+import resolve_rich_presence as rrp
+
+SCRIPT = os.path.abspath(rrp.__file__)
+LAUNCHES = 8
+
+
+@pytest.fixture
+def control_socket():
+    # Not under tmp_path: Unix socket paths are limited to about 100 bytes, and macOS temp dirs are long
+    with tempfile.TemporaryDirectory(dir="/tmp") as directory:
+        yield os.path.join(directory, "control.sock")
+
+
+def launch(control_socket, *args):
+    return subprocess.Popen([sys.executable, SCRIPT, "--headless", "--no-time-log", "--control-socket",
+                             control_socket, *args], stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+
+
+def send(control_socket, command):
+    result = subprocess.run([sys.executable, SCRIPT, "--send", command, "--control-socket", control_socket],
+                            capture_output=True, text=True, timeout=30)
+    return result.returncode, result.stdout
+
+
+def test_racing_launches_leave_one_instance(control_socket):
+    launches = [launch(control_socket) for _ in range(LAUNCHES)]
+    forwarded = []
+    try:
+        deadline = time.monotonic() + 30
+        while sum(process.poll() is None for process in launches) > 1 and time.monotonic() < deadline:
+            time.sleep(0.1)
+        for process in launches:
+            if process.poll() is None:
+                continue  # The instance
+            output, _ = process.communicate()
+            assert process.returncode == 0, output
+            assert "ResolveRPC is already running." in output
+            forwarded.append(json.loads(output[output.index("{"):]))
+        running = [process for process in launches if process.poll() is None]
+        assert len(running) == 1 and len(forwarded) == LAUNCHES - 1
+        assert all(reply["ok"] and reply["resolve"] == "Absent" for reply in forwarded)
+
+        returncode, output = send(control_socket, "status")
+        assert returncode == 0 and json.loads(output)["ok"]
+        returncode, output = send(control_socket, "quit")
+        assert returncode == 0 and json.loads(output) == {"ok": True}
+        output, _ = running[0].communicate(timeout=15)
+        assert running[0].returncode == 0
+        assert "Quit requested by another launch." in output and "ResolveRPC has exited." in output
+    finally:
+        for process in launches:
+            if process.poll() is None:
+                process.kill()
+                process.communicate()
+
+    assert not os.path.exists(control_socket)
+    returncode, output = send(control_socket, "status")
+    assert returncode == 1 and "ResolveRPC is not running." in output
@@ -0,0 +1,45 @@
+import tracemalloc
+
+import pytest
+
+import resolve_rich_presence as rrp
+from fakes import Simulation
+from scenarios import flapping
+
+
+@pytest.fixture
+def tracing():
+    yield
+    tracemalloc.stop()
+
+
+class LeakingSink:
+    """A status sink that keeps 4 KiB per status message: the kind of leak the soak has to catch."""
+    def __init__(self):
+        self.kept = []
+
+    def update_status(self, monitor, message):
+        self.kept.append(message.encode() * (4096 // max(1, len(message))))
+
+
+def soak(cycles, limit, status_sinks=()):
+    tracker = rrp.MemoryTracker(limit=limit)
+    sim = Simulation(discord_ipc=True, memory_tracker=tracker, status_sinks=status_sinks)
+    sim.start()
+    flapping(sim, cycles=cycles)
+    within_limit = tracker.check()
+    sim.stop()
+    return sim, tracker, within_limit
+
+
+def test_reconnect_cycles_retain_nothing(tracing):
+    sim, tracker, within_limit = soak(cycles=100, limit=256 * 1024)
+    assert sim.reconnects() == {"Discord": 100, "Resolve": 100}
+    assert sim.monitor.metrics.errors["memory_growth"] == 0  # Periodic checks every MEMORY_CHECK_INTERVAL
+    assert within_limit and tracker.growth <= 256 * 1024
+
+
+def test_a_leak_is_caught(tracing):
+    sim, tracker, within_limit = soak(cycles=100, limit=256 * 1024, status_sinks=[LeakingSink()])
+    assert sim.monitor.metrics.errors["memory_growth"] > 0
+    assert not within_limit and tracker.growth > tracker.limit
@@ -0,0 +1,38 @@
+import pytest
+
+import resolve_rich_presence as rrp
+from fakes import Simulation
+
+DISCORD_CONNECT = 1.0
+RESOLVE_CONNECT = 1.5
+
+
+def first_update_after(sim, timeout=30):
+    while not sim.discord.updates and sim.now < timeout:
+        sim.advance(0.1)
+    return sim.discord.updates[0][0]
+
+
+def test_cold_start_waits_for_the_slower_side_only():
+    sim = Simulation(discord_connect_latency=DISCORD_CONNECT, resolve_connect_latency=RESOLVE_CONNECT)
+    sim.resolve.open_project("Film")
+    sim.start()
+    first = first_update_after(sim)
+    sim.stop()
+    assert first == pytest.approx(max(DISCORD_CONNECT, RESOLVE_CONNECT), abs=0.1)
+    assert first < DISCORD_CONNECT + RESOLVE_CONNECT
+    assert sim.discord.updates[0][1]["state"] == "Editing: Timeline 1"
+
+
+def test_resolve_is_followed_without_discord():
+    sim = Simulation()
+    sim.resolve.open_project("Film")
+    sim.quit_discord()
+    sim.start()
+    sim.advance(10)
+    assert sim.monitor.project_state == ("Film", "Timeline 1")
+    assert sim.monitor.short_status() == "DRPC (No Discord)"
+    sim.launch_discord()
+    sim.advance(rrp.PROCESS_START_POLL_INTERVAL)
+    assert sim.discord.activity["details"] == "Project: Film"  # Published once Discord is back
+    sim.stop()
@@ -0,0 +1,184 @@
+import datetime
+import os
+
+import pytest
+
+import resolve_rich_presence as rrp
+
+FILM = ("Film", "Cut")
+GAP = rrp.TIME_LOG_IDLE_GAP
+
+
+def at(day, hour, minute=0):
+    """Local timestamp of hour:minute on day."""
+    return datetime.datetime.combine(day, datetime.time(hour, minute)).timestamp()
+
+
+MONDAY = datetime.date(2026, 10, 12)
+T0 = at(MONDAY, 10)
+
+
+class Clock:
+    def __init__(self, now=T0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def open_log(tmp_path, clock):
+    """Opens the log in tmp_path as a (re)started monitor does."""
+    def open_log():
+        log = rrp.EditingTimeLog(str(tmp_path), clock=clock)
+        log.load()
+        return log
+    return open_log
+
+
+def edit(log, clock, seconds, project_state=FILM, every=rrp.POLL_INTERVAL_MAX):
+    """Polls project_state for seconds, then once more at the end."""
+    end = clock.now + seconds
+    while clock.now < end:
+        log.observe(project_state)
+        clock.now = min(end, clock.now + every)
+    log.observe(project_state)
+
+
+def test_session_left_open_by_a_crash_ends_at_its_last_heartbeat(open_log, clock):
+    log = open_log()
+    edit(log, clock, 600)
+    log.flush()  # With a "seen" at the last poll; then the process dies
+    clock.now += 3600
+    log = open_log()
+    assert log.totals() == {"Film": 600}
+    assert log.run_start is None
+    log.close()
+    assert log.totals() == {"Film": 600}
+
+
+@pytest.mark.parametrize("crash_at", ["truncate", "second write"])
+def test_crash_between_compaction_steps_does_not_count_twice(open_log, clock, monkeypatch, crash_at):
+    log = open_log()
+    edit(log, clock, 600)
+    log.observe(None)
+
+    write_aggregates = rrp.EditingTimeLog._write_aggregates
+    writes = []
+
+    def crashing_write(self, fold, offset):
+        writes.append(offset)
+        if crash_at == "second write" and len(writes) == 2:
+            raise KeyboardInterrupt("crash")
+        write_aggregates(self, fold, offset)
+
+    def crashing_truncate(path, length):
+        raise KeyboardInterrupt("crash")
+
+    monkeypatch.setattr(rrp.EditingTimeLog, "_write_aggregates", crashing_write)
+    if crash_at == "truncate":
+        monkeypatch.setattr(rrp.os, "truncate", crashing_truncate)
+    with pytest.raises(KeyboardInterrupt):
+        log.compact()
+    monkeypatch.undo()
+
+    clock.now += 60
+    log = open_log()
+    assert log.totals() == {"Film": 600}
+    edit(log, clock, 300)
+    log.close()
+    assert log.totals() == {"Film": 900}
+    assert os.path.getsize(log.log_path) == 0
+
+
+def test_torn_last_line_is_skipped(open_log, clock):
+    log = open_log()
+    edit(log, clock, 600)
+    log.close()
+    with open(log.log_path, "a") as f:
+        f.write('["start",%d,"Film","Cu' % clock.now)  # Power lost mid-write
+    assert log.totals() == {"Film": 600}
+    clock.now += 60
+    log = open_log()  # Compacts the torn line away before appending
+    edit(log, clock, 300, ("Short", None))
+    log.close()
+    assert log.totals() == {"Film": 600, "Short": 300}
+
+
+def test_idle_gap_splits_sessions(open_log, clock):
+    log = open_log()
+    edit(log, clock, 600)
+    assert log.run_start == T0
+    clock.now += GAP + 60  # Asleep, or Resolve hung: nothing observed
+    resumed = clock.now
+    edit(log, clock, 300)
+    assert log.run_start == resumed  # A new run, not one lasting through the gap
+    log.close()
+    assert log.totals() == {"Film": 900}  # The gap isn't counted
+
+
+def test_short_gap_continues_the_run(open_log, clock):
+    log = open_log()
+    edit(log, clock, 600)
+    log.observe(None)  # Project closed
+    clock.now += GAP / 2
+    edit(log, clock, 300, ("Film", "Grade"))
+    assert log.run_start == T0
+    log.close()
+    assert log.totals() == {"Film": 900}
+
+
+@pytest.mark.parametrize("downtime, resumes", [(GAP / 2, True), (GAP * 2, False)])
+def test_run_start_across_a_restart(open_log, clock, downtime, resumes):
+    log = open_log()
+    edit(log, clock, 600)
+    log.close()
+    clock.now += downtime
+    restarted = clock.now
+    log = open_log()
+    assert log.run_start is None
+    log.observe(FILM)
+    assert log.run_start == (T0 if resumes else restarted)
+
+
+def test_session_across_midnight_is_split_by_day(open_log, clock):
+    clock.now = at(MONDAY, 23, 30)
+    log = open_log()
+    edit(log, clock, 3600)
+    log.close()
+    tuesday = (MONDAY + datetime.timedelta(days=1)).isoformat()
+    assert log.totals() == {"Film": 3600}
+    assert log.totals(since=tuesday) == {"Film": 1800}
+    assert list(rrp.split_by_day(at(MONDAY, 23, 30), at(MONDAY, 23, 30) + 3600)) == \
+        [(MONDAY.isoformat(), 1800), (tuesday, 1800)]
+
+
+def test_week_report_reads_the_aggregates_and_the_log_tail(tmp_path, clock, capsys):
+    today = datetime.date.today()
+    monday = today - datetime.timedelta(days=today.weekday())
+    clock.now = at(monday - datetime.timedelta(days=3), 10)  # Last week: not in this week's report
+    log = rrp.EditingTimeLog(str(tmp_path), clock=clock)
+    log.load()
+    edit(log, clock, 3600, ("Old", None))
+    log.observe(None)
+    clock.now = at(monday, 10)
+    edit(log, clock, 2 * 3600)
+    log.close()  # Compacted into the aggregates
+    clock.now = at(today, 22)  # After Monday's session, even on a Monday
+    log = rrp.EditingTimeLog(str(tmp_path), clock=clock)
+    log.load()
+    edit(log, clock, 1800, ("Short", None))
+    log.flush()  # Only in the log, still open
+    assert os.path.getsize(log.log_path) > 0
+
+    rrp.main(["--report", "week", "--time-log", str(tmp_path)])
+    assert capsys.readouterr().out.splitlines() == [
+        "Editing time this week: 2.5 h",
+        "  Film      2.0 h",
+        "  Short     0.5 h",
+    ]
@@ -0,0 +1,107 @@
+import asyncio
+
+import pytest
+
+import resolve_rich_presence as rrp
+from fakes import Simulation, VirtualTimeLoop
+
+HOUR = 3600
+
+
+@pytest.fixture
+def loop():
+    loop = VirtualTimeLoop()
+    yield loop
+    loop.close()
+
+
+def every(timers, interval, fired, offset=0.0):
+    """Runs a job every interval seconds, first after interval + offset; records its fire times."""
+    def job():
+        fired.append(timers._loop.time())
+        timers.call_later(interval, job)
+    timers.call_later(interval + offset, job)
+
+
+def test_sleeps_until_the_next_due_timer(loop):
+    timers = rrp.TimerScheduler(loop)
+    fired = []
+    every(timers, 15, fired)
+    every(timers, 30, fired, offset=7)
+    loop.run_until_complete(asyncio.sleep(HOUR))
+    # Only wakes for due jobs, none in between: not the 3600 of a 1-second polling loop
+    assert timers.wakeups == len(set(fired))
+    assert len(fired) >= HOUR // (15 + rrp.TIMER_SLACK_MAX) + HOUR // (30 + rrp.TIMER_SLACK_MAX) - 1
+    assert timers.wakeups <= HOUR // 15 + HOUR // 30
+
+
+def test_timers_due_close_together_share_a_wake_up(loop):
+    timers = rrp.TimerScheduler(loop)
+    fired = []
+    every(timers, 15, fired)
+    every(timers, 15, fired, offset=0.5)  # Within the slack of a 15 s timer (1 s)
+    loop.run_until_complete(asyncio.sleep(HOUR))
+    assert len(fired) >= 2 * (HOUR // (15 + rrp.TIMER_SLACK_MAX) - 1)
+    assert timers.wakeups == len(fired) // 2  # Both jobs every time
+
+
+def test_cancelled_timers_do_not_wake(loop):
+    timers = rrp.TimerScheduler(loop)
+    for delay in range(1, 100):
+        timers.cancel(timers.call_later(delay, lambda: None))
+    loop.run_until_complete(asyncio.sleep(HOUR))
+    assert timers.wakeups <= 1
+
+
+def test_sleep_ends_as_soon_as_woken(loop):
+    timers = rrp.TimerScheduler(loop)
+
+    async def main():
+        wakeup = asyncio.Event()
+        loop.call_later(2, wakeup.set)
+        await timers.sleep(HOUR, wakeup)
+        assert not wakeup.is_set()  # Cleared for the next sleep
+        return loop.time()
+    assert loop.run_until_complete(main()) == 2
+
+
+@pytest.mark.parametrize("project", [None, "Film"])
+def test_monitor_wakes_about_once_per_poll_interval(project):
+    sim = Simulation()
+    if project:
+        sim.resolve.open_project(project)
+    sim.start()
+    sim.advance(60)  # Past the start-up polls
+    wakeups = sim.monitor.timers.wakeups
+    sim.advance(HOUR)
+    wakeups = sim.monitor.timers.wakeups - wakeups
+    # Discord's health check and the Resolve polls at their steady (idle or active) cadence
+    poll_interval = rrp.POLL_INTERVAL_MAX if project else rrp.POLL_INTERVAL_IDLE_MAX
+    assert wakeups <= HOUR / rrp.DISCORD_CHECK_INTERVAL + HOUR / poll_interval
+    stopping = sim.now
+    sim.stop()
+    assert sim.now == stopping  # Shutdown wakes everything at once, no tick to wait out
+
+
+@pytest.mark.parametrize("launch_events", [False, True])
+def test_monitor_barely_wakes_while_nothing_runs(launch_events):
+    sim = Simulation(launch_events=launch_events)
+    sim.processes.kill("Discord")
+    sim.processes.kill("Resolve")
+    sim.start()
+    sim.advance(60)
+    wakeups = sim.monitor.timers.wakeups
+    sim.advance(HOUR)
+    wakeups = sim.monitor.timers.wakeups - wakeups
+    # Both links check for their process; with launches reported as events, only as a fallback
+    interval = rrp.PROCESS_START_POLL_INTERVAL_OBSERVED if launch_events else rrp.PROCESS_START_POLL_INTERVAL
+    assert wakeups <= 2 * HOUR / interval
+
+    sim.resolve.open_project("Film")
+    sim.launch_discord()
+    sim.launch_resolve()
+    sim.expect("Editing: Timeline 1")
+    sim.advance(interval)
+    (latency,) = sim.latencies()
+    assert latency is not None and latency <= (1 if launch_events else interval + 1)
+    sim.stop()